@@ -13,6 +13,33 @@ import { normalizeIndex } from "../routes/dataShared.js";
 // Helpers
 // ---------------------------------------------------------------------------
 
+// Only the columns the row converters read — projected in the LanceDB scans
+// so unused column chunks are never decoded.
+const EDGE_COLUMNS = [
+  "edge_id",
+  "edge_kind",
+  "src_tweet_id",
+  "dst_tweet_id",
+  "src_ls_index",
+  "dst_ls_index",
+  "internal_target",
+  "provenance",
+  "source_url",
+];
+
+const NODE_STATS_COLUMNS = [
+  "tweet_id",
+  "ls_index",
+  "thread_root_id",
+  "thread_depth",
+  "thread_size",
+  "reply_child_count",
+  "reply_in_count",
+  "reply_out_count",
+  "quote_in_count",
+  "quote_out_count",
+];
+
 function toEdgeRow(row: Record<string, unknown>): EdgeRow {
   const srcIdx = normalizeIndex(row.src_ls_index);
   const dstIdx = normalizeIndex(row.dst_ls_index);
@@ -45,47 +72,251 @@ function toNodeStatsRow(row: Record<string, unknown>): NodeStatsRow {
   };
 }
 
+// ---------------------------------------------------------------------------
+// Scan cache
+// ---------------------------------------------------------------------------
+
+// Full-table scans keyed by the LanceDB table version, which bumps on every
+// write — the equivalent of mtime-based invalidation for parquet files.
+interface CacheEntry<T> {
+  version: number;
+  value: T;
+}
+
+// Raw rows plus normalized src/dst index arrays (-1 for null), built once per
+// scan so index filtering never re-normalizes per request.
+interface EdgeScan {
+  rows: Record<string, unknown>[];
+  srcIdx: Int32Array;
+  dstIdx: Int32Array;
+}
+
+const SCAN_CACHE_MAX = 32;
+const rawEdgeCache = new Map<string, CacheEntry<EdgeScan>>();
+const nodeStatsCache = new Map<string, CacheEntry<NodeStatsRow[]>>();
+
+// Reply graph in CSR form over dense int node ids: string tweet ids are
+// interned once at build time so the per-request chain walk and BFS run over
+// packed typed arrays instead of string-keyed maps.
+interface ReplyAdjacency {
+  replyEdges: EdgeRow[];
+  idByTweet: Map<string, number>;
+  tweets: string[];
+  lsByIdx: (number | null)[];
+  /** parent node id per node, -1 if none. */
+  parentOf: Int32Array;
+  /** CSR children: childIdx[childIndptr[v]..childIndptr[v+1]) are v's children. */
+  childIndptr: Int32Array;
+  childIdx: Int32Array;
+  /** per-edge endpoint node ids, aligned with replyEdges. */
+  edgeSrc: Int32Array;
+  edgeDst: Int32Array;
+  /** node_stats table version the ls_index values were built from (-1 if absent). */
+  statsVersion: number;
+}
+
+const replyAdjCache = new Map<string, CacheEntry<ReplyAdjacency>>();
+
+interface QuoteIndex {
+  outBySrc: Map<string, EdgeRow[]>;
+  inByDst: Map<string, EdgeRow[]>;
+}
+
+const quoteIndexCache = new Map<string, CacheEntry<QuoteIndex>>();
+const nodeStatsColumnarCache = new Map<string, CacheEntry<JsonRecord>>();
+
+function buildEdgeScan(rows: Record<string, unknown>[]): EdgeScan {
+  const srcIdx = new Int32Array(rows.length);
+  const dstIdx = new Int32Array(rows.length);
+  for (let i = 0; i < rows.length; i++) {
+    const src = normalizeIndex(rows[i].src_ls_index);
+    const dst = normalizeIndex(rows[i].dst_ls_index);
+    srcIdx[i] = src !== null && src >= 0 ? src : -1;
+    dstIdx[i] = dst !== null && dst >= 0 ? dst : -1;
+  }
+  return { rows, srcIdx, dstIdx };
+}
+
+function setCached<T>(cache: Map<string, CacheEntry<T>>, key: string, entry: CacheEntry<T>) {
+  cache.delete(key);
+  cache.set(key, entry);
+  while (cache.size > SCAN_CACHE_MAX) {
+    const oldest = cache.keys().next().value as string;
+    cache.delete(oldest);
+  }
+}
+
 // ---------------------------------------------------------------------------
 // LanceGraphRepo
 // ---------------------------------------------------------------------------
 
 export class LanceGraphRepo {
   /**
-   * Get all edges for a dataset, optionally filtered by kind.
+   * Get raw edge rows for a dataset, optionally filtered by kind.
+   * Results are cached per table version so repeat requests skip the scan.
    */
-  async getEdges(dataset: string, edgeKinds?: string[]): Promise<EdgeRow[]> {
+  private async getRawEdges(dataset: string, edgeKinds?: string[]): Promise<EdgeScan> {
     const table = await getGraphTable(dataset, "edges");
-    let query = table.query();
+    const version = await table.version();
+    const key = `${dataset}::${(edgeKinds ?? []).slice().sort().join(",")}`;
+    const hit = rawEdgeCache.get(key);
+    if (hit && hit.version === version) return hit.value;
+
+    let rows: Record<string, unknown>[] | null = null;
+
+    // If the unfiltered scan for this version is already cached, partition it
+    // in-process instead of issuing another table scan per kind.
     if (edgeKinds && edgeKinds.length > 0) {
-      const kindList = edgeKinds.map((k) => `'${k.replace(/'/g, "''")}'`).join(", ");
-      query = query.where(`edge_kind IN (${kindList})`);
+      const allHit = rawEdgeCache.get(`${dataset}::`);
+      if (allHit && allHit.version === version) {
+        const kinds = new Set(edgeKinds);
+        rows = allHit.value.rows.filter((r) => kinds.has(String(r.edge_kind ?? "")));
+      }
     }
-    const rows = await query.toArray();
-    return rows.map((r) => toEdgeRow(r as Record<string, unknown>));
+
+    if (rows === null) {
+      let query = table.query().select(EDGE_COLUMNS);
+      if (edgeKinds && edgeKinds.length > 0) {
+        const kindList = edgeKinds.map((k) => `'${k.replace(/'/g, "''")}'`).join(", ");
+        query = query.where(`edge_kind IN (${kindList})`);
+      }
+      rows = (await query.toArray()) as Record<string, unknown>[];
+    }
+
+    const scan = buildEdgeScan(rows);
+    setCached(rawEdgeCache, key, { version, value: scan });
+    return scan;
   }
 
   /**
-   * Get edges filtered by ls_index set (src or dst matches).
+   * Get all edges for a dataset, optionally filtered by kind.
+   */
+  async getEdges(dataset: string, edgeKinds?: string[]): Promise<EdgeRow[]> {
+    const { rows } = await this.getRawEdges(dataset, edgeKinds);
+    return rows.map((r) => toEdgeRow(r));
+  }
+
+  /**
+   * Get edges filtered by ls_index set (src or dst matches). An empty index
+   * list matches every edge.
+   *
+   * Filters and counts on the raw rows; toEdgeRow only runs for the first
+   * maxEdges matches, so the total is a plain counter rather than the length
+   * of a fully materialized array.
    */
   async getEdgesByIndices(
     dataset: string,
     indices: number[],
-    opts?: { edgeKinds?: string[]; includeExternal?: boolean },
+    opts?: { edgeKinds?: string[]; includeExternal?: boolean; maxEdges?: number },
   ): Promise<{ edges: EdgeRow[]; total: number }> {
-    const allEdges = await this.getEdges(dataset, opts?.edgeKinds);
+    const { rows, srcIdx, dstIdx } = await this.getRawEdges(dataset, opts?.edgeKinds);
+
+    const indexSet = indices.length > 0 ? new Set(indices) : null;
+    const includeExternal = Boolean(opts?.includeExternal);
+    const maxEdges = opts?.maxEdges ?? Infinity;
+    const edges: EdgeRow[] = [];
+    let total = 0;
+    for (let i = 0; i < rows.length; i++) {
+      const src = srcIdx[i];
+      const dst = dstIdx[i];
+      if (indexSet && !((src >= 0 && indexSet.has(src)) || (dst >= 0 && indexSet.has(dst)))) {
+        continue;
+      }
+      if (!includeExternal && dst < 0) continue;
+      total++;
+      if (edges.length < maxEdges) edges.push(toEdgeRow(rows[i]));
+    }
+
+    return { edges, total };
+  }
+
+  /**
+   * Build (and cache) the reply-edge adjacency maps for a dataset.
+   *
+   * Rebuilding parent/children maps per thread request is O(E); caching them
+   * per table version leaves only the chain walk and BFS on the request path.
+   */
+  private async getReplyAdjacency(dataset: string): Promise<ReplyAdjacency> {
+    const table = await getGraphTable(dataset, "edges");
+    const version = await table.version();
+
+    let statsVersion = -1;
+    try {
+      const statsTable = await getGraphTable(dataset, "node_stats");
+      statsVersion = await statsTable.version();
+    } catch {
+      // No node stats available
+    }
+
+    const hit = replyAdjCache.get(dataset);
+    if (hit && hit.version === version && hit.value.statsVersion === statsVersion) {
+      return hit.value;
+    }
 
-    const indexSet = new Set(indices);
-    let filtered = allEdges.filter(
-      (edge) =>
-        (edge.src_ls_index !== null && indexSet.has(edge.src_ls_index)) ||
-        (edge.dst_ls_index !== null && indexSet.has(edge.dst_ls_index)),
-    );
+    const { rows: replyRows } = await this.getRawEdges(dataset, ["reply"]);
+    const replyEdges = replyRows.map((r) => toEdgeRow(r));
 
-    if (!opts?.includeExternal) {
-      filtered = filtered.filter((edge) => edge.dst_ls_index !== null);
+    // Intern tweet ids to dense ints. node_stats is the source of truth for
+    // ls_index; edge-carried values only fill nodes stats doesn't cover.
+    const idByTweet = new Map<string, number>();
+    const tweets: string[] = [];
+    const lsByIdx: (number | null)[] = [];
+    const intern = (tweetId: string, lsIndex: number | null): number => {
+      let id = idByTweet.get(tweetId);
+      if (id === undefined) {
+        id = tweets.length;
+        idByTweet.set(tweetId, id);
+        tweets.push(tweetId);
+        lsByIdx.push(lsIndex);
+      }
+      return id;
+    };
+
+    if (statsVersion >= 0) {
+      const nodeStats = await this.getNodeStats(dataset);
+      for (const row of nodeStats) {
+        if (row.tweet_id) intern(row.tweet_id, row.ls_index);
+      }
+    }
+
+    const e = replyEdges.length;
+    const edgeSrc = new Int32Array(e);
+    const edgeDst = new Int32Array(e);
+    for (let i = 0; i < e; i++) {
+      edgeSrc[i] = intern(replyEdges[i].src_tweet_id, replyEdges[i].src_ls_index);
+      edgeDst[i] = intern(replyEdges[i].dst_tweet_id, replyEdges[i].dst_ls_index);
+    }
+
+    // CSR children arrays: count per parent, prefix-sum, then fill with a
+    // cursor copy. Edge order is preserved within each parent.
+    const n = tweets.length;
+    const parentOf = new Int32Array(n).fill(-1);
+    const childIndptr = new Int32Array(n + 1);
+    for (let i = 0; i < e; i++) {
+      parentOf[edgeSrc[i]] = edgeDst[i];
+      childIndptr[edgeDst[i] + 1]++;
+    }
+    for (let v = 0; v < n; v++) childIndptr[v + 1] += childIndptr[v];
+    const cursor = childIndptr.slice(0, n);
+    const childIdx = new Int32Array(e);
+    for (let i = 0; i < e; i++) {
+      childIdx[cursor[edgeDst[i]]++] = edgeSrc[i];
     }
 
-    return { edges: filtered, total: filtered.length };
+    const value = {
+      replyEdges,
+      idByTweet,
+      tweets,
+      lsByIdx,
+      parentOf,
+      childIndptr,
+      childIdx,
+      edgeSrc,
+      edgeDst,
+      statsVersion,
+    };
+    setCached(replyAdjCache, dataset, { version, value });
+    return value;
   }
 
   /**
@@ -103,71 +334,101 @@ export class LanceGraphRepo {
     const chainLimit = opts?.chainLimit ?? 300;
     const descLimit = opts?.descLimit ?? 3000;
 
-    const table = await getGraphTable(dataset, "edges");
-    const replyRows = await table.query().where("edge_kind = 'reply'").toArray();
-    const replyEdges = replyRows.map((r) => toEdgeRow(r as Record<string, unknown>));
+    const { replyEdges, idByTweet, tweets, lsByIdx, parentOf, childIndptr, childIdx, edgeSrc, edgeDst } =
+      await this.getReplyAdjacency(dataset);
 
-    // Build node_stats ls_index lookup
-    const lsByTweet = new Map<string, number | null>();
-    try {
-      const nodeStats = await this.getNodeStats(dataset);
-      for (const row of nodeStats) {
-        if (row.tweet_id) lsByTweet.set(row.tweet_id, row.ls_index);
-      }
-    } catch {
-      // No node stats available
-    }
-
-    const parentBySrc = new Map<string, string>();
-    const childrenByDst = new Map<string, string[]>();
-    for (const edge of replyEdges) {
-      parentBySrc.set(edge.src_tweet_id, edge.dst_tweet_id);
-      const children = childrenByDst.get(edge.dst_tweet_id) ?? [];
-      children.push(edge.src_tweet_id);
-      childrenByDst.set(edge.dst_tweet_id, children);
+    const parentChain: JsonRecord[] = [];
+    const descendants: JsonRecord[] = [];
+    const componentEdges: EdgeRow[] = [];
 
-      if (!lsByTweet.has(edge.src_tweet_id)) lsByTweet.set(edge.src_tweet_id, edge.src_ls_index);
-      if (!lsByTweet.has(edge.dst_tweet_id)) lsByTweet.set(edge.dst_tweet_id, edge.dst_ls_index);
+    const root = idByTweet.get(tweetId);
+    if (root === undefined) {
+      // Tweet not in the reply graph — nothing to traverse.
+      return { parentChain, descendants, edges: componentEdges };
     }
 
+    // All traversal runs over the packed int arrays; strings only reappear
+    // when building the response records.
+    const n = tweets.length;
+    const inComponent = new Uint8Array(n);
+    inComponent[root] = 1;
+
     // Walk parent chain
-    const parentChain: JsonRecord[] = [];
-    const visitedChain = new Set<string>([tweetId]);
-    let current = tweetId;
-    while (parentBySrc.has(current) && parentChain.length < chainLimit) {
-      const parent = parentBySrc.get(current) as string;
-      if (visitedChain.has(parent)) break;
-      parentChain.push({ tweet_id: parent, ls_index: lsByTweet.get(parent) ?? null });
-      visitedChain.add(parent);
+    let current = root;
+    while (parentChain.length < chainLimit) {
+      const parent = parentOf[current];
+      if (parent < 0 || inComponent[parent]) break;
+      parentChain.push({ tweet_id: tweets[parent], ls_index: lsByIdx[parent] });
+      inComponent[parent] = 1;
       current = parent;
     }
 
-    // BFS descendants
-    const descendants: JsonRecord[] = [];
-    const seenDesc = new Set<string>();
-    const queue = [...(childrenByDst.get(tweetId) ?? [])];
-    while (queue.length > 0 && descendants.length < descLimit) {
-      const node = queue.shift() as string;
-      if (seenDesc.has(node)) continue;
-      seenDesc.add(node);
-      descendants.push({ tweet_id: node, ls_index: lsByTweet.get(node) ?? null });
-      queue.push(...(childrenByDst.get(node) ?? []));
-    }
-
-    // Collect component edges
-    const componentNodes = new Set<string>([tweetId]);
-    for (const node of parentChain) componentNodes.add(String(node.tweet_id));
-    for (const node of descendants) componentNodes.add(String(node.tweet_id));
-
-    const componentEdges = replyEdges
-      .filter(
-        (edge) => componentNodes.has(edge.src_tweet_id) || componentNodes.has(edge.dst_tweet_id),
-      )
-      .slice(0, 5000);
+    // BFS descendants over CSR children; nodes are marked seen at enqueue so
+    // the fixed-size queue never exceeds the node count.
+    const seen = new Uint8Array(n);
+    const queue = new Int32Array(n);
+    let head = 0;
+    let tail = 0;
+    for (let j = childIndptr[root]; j < childIndptr[root + 1]; j++) {
+      const child = childIdx[j];
+      if (!seen[child]) {
+        seen[child] = 1;
+        queue[tail++] = child;
+      }
+    }
+    while (head < tail && descendants.length < descLimit) {
+      const node = queue[head++];
+      inComponent[node] = 1;
+      descendants.push({ tweet_id: tweets[node], ls_index: lsByIdx[node] });
+      for (let j = childIndptr[node]; j < childIndptr[node + 1]; j++) {
+        const child = childIdx[j];
+        if (!seen[child]) {
+          seen[child] = 1;
+          queue[tail++] = child;
+        }
+      }
+    }
+
+    // Collect component edges: flag-array membership test per edge endpoint,
+    // stopping at the response cap.
+    for (let i = 0; i < replyEdges.length; i++) {
+      if (inComponent[edgeSrc[i]] || inComponent[edgeDst[i]]) {
+        componentEdges.push(replyEdges[i]);
+        if (componentEdges.length >= 5000) break;
+      }
+    }
 
     return { parentChain, descendants, edges: componentEdges };
   }
 
+  /**
+   * Build (and cache) quote edges grouped by src and dst tweet id, so quote
+   * lookups are O(matches) instead of a full scan per request.
+   */
+  private async getQuoteIndex(dataset: string): Promise<QuoteIndex> {
+    const table = await getGraphTable(dataset, "edges");
+    const version = await table.version();
+    const hit = quoteIndexCache.get(dataset);
+    if (hit && hit.version === version) return hit.value;
+
+    const { rows: quoteRows } = await this.getRawEdges(dataset, ["quote"]);
+    const outBySrc = new Map<string, EdgeRow[]>();
+    const inByDst = new Map<string, EdgeRow[]>();
+    for (const raw of quoteRows) {
+      const edge = toEdgeRow(raw);
+      const out = outBySrc.get(edge.src_tweet_id) ?? [];
+      out.push(edge);
+      outBySrc.set(edge.src_tweet_id, out);
+      const incoming = inByDst.get(edge.dst_tweet_id) ?? [];
+      incoming.push(edge);
+      inByDst.set(edge.dst_tweet_id, incoming);
+    }
+
+    const value = { outBySrc, inByDst };
+    setCached(quoteIndexCache, dataset, { version, value });
+    return value;
+  }
+
   /**
    * Get quote edges for a specific tweet (incoming and outgoing).
    */
@@ -182,12 +443,10 @@ export class LanceGraphRepo {
     incomingTotal: number;
   }> {
     const maxLimit = limit ?? 2000;
-    const table = await getGraphTable(dataset, "edges");
-    const quoteRows = await table.query().where("edge_kind = 'quote'").toArray();
-    const quoteEdges = quoteRows.map((r) => toEdgeRow(r as Record<string, unknown>));
+    const { outBySrc, inByDst } = await this.getQuoteIndex(dataset);
 
-    const outgoingAll = quoteEdges.filter((edge) => edge.src_tweet_id === tweetId);
-    const incomingAll = quoteEdges.filter((edge) => edge.dst_tweet_id === tweetId);
+    const outgoingAll = outBySrc.get(tweetId) ?? [];
+    const incomingAll = inByDst.get(tweetId) ?? [];
 
     return {
       outgoing: outgoingAll.slice(0, maxLimit),
@@ -202,8 +461,44 @@ export class LanceGraphRepo {
    */
   async getNodeStats(dataset: string): Promise<NodeStatsRow[]> {
     const table = await getGraphTable(dataset, "node_stats");
-    const rows = await table.query().toArray();
-    return rows.map((r) => toNodeStatsRow(r as Record<string, unknown>));
+    const version = await table.version();
+    const hit = nodeStatsCache.get(dataset);
+    if (hit && hit.version === version) return hit.value;
+
+    const rows = await table.query().select(NODE_STATS_COLUMNS).toArray();
+    const stats = rows.map((r) => toNodeStatsRow(r as Record<string, unknown>));
+    setCached(nodeStatsCache, dataset, { version, value: stats });
+    return stats;
+  }
+
+  /**
+   * Get node stats in columnar form (one array per field), as served by the
+   * node-stats endpoint. Built with preallocated arrays in a single pass and
+   * cached per table version so repeat requests skip the O(N) reshaping.
+   */
+  async getNodeStatsColumns(dataset: string): Promise<JsonRecord> {
+    const table = await getGraphTable(dataset, "node_stats");
+    const version = await table.version();
+    const hit = nodeStatsColumnarCache.get(dataset);
+    if (hit && hit.version === version) return hit.value;
+
+    const rows = await this.getNodeStats(dataset);
+    const n = rows.length;
+    const result: JsonRecord = {};
+    const columns: Record<string, unknown[]> = {};
+    for (const col of NODE_STATS_COLUMNS) {
+      columns[col] = new Array(n);
+      result[col] = columns[col];
+    }
+    for (let i = 0; i < n; i++) {
+      const row = rows[i] as unknown as Record<string, unknown>;
+      for (const col of NODE_STATS_COLUMNS) {
+        columns[col][i] = row[col];
+      }
+    }
+
+    setCached(nodeStatsColumnarCache, dataset, { version, value: result });
+    return result;
   }
 
   /**
@@ -16,6 +16,13 @@ function toNumberOrNull(value: unknown): number | null {
 }
 
 export function normalizeIndex(value: unknown): number | null {
+  // Hot path: the graph scans call this per edge field, and the value is
+  // almost always already a plain number (or null). NaN/Infinity fail the
+  // integer check, so this matches the general path exactly.
+  if (typeof value === "number") {
+    return Number.isInteger(value) ? value : null;
+  }
+  if (value == null) return null;
   const n = toNumberOrNull(value);
   return n !== null && Number.isInteger(n) ? n : null;
 }
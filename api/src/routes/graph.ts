@@ -24,33 +24,7 @@ export const graphRoutes = new Hono()
   .get("/datasets/:dataset/links/node-stats", async (c) => {
     const dataset = c.req.param("dataset");
     try {
-      const rows = await lanceGraphRepo.getNodeStats(dataset);
-      const result: JsonRecord = {
-        ls_index: [],
-        tweet_id: [],
-        thread_root_id: [],
-        thread_depth: [],
-        thread_size: [],
-        reply_child_count: [],
-        reply_in_count: [],
-        reply_out_count: [],
-        quote_in_count: [],
-        quote_out_count: [],
-      };
-
-      for (const row of rows) {
-        (result.ls_index as unknown[]).push(row.ls_index);
-        (result.tweet_id as unknown[]).push(row.tweet_id);
-        (result.thread_root_id as unknown[]).push(row.thread_root_id);
-        (result.thread_depth as unknown[]).push(row.thread_depth);
-        (result.thread_size as unknown[]).push(row.thread_size);
-        (result.reply_child_count as unknown[]).push(row.reply_child_count);
-        (result.reply_in_count as unknown[]).push(row.reply_in_count);
-        (result.reply_out_count as unknown[]).push(row.reply_out_count);
-        (result.quote_in_count as unknown[]).push(row.quote_in_count);
-        (result.quote_out_count as unknown[]).push(row.quote_out_count);
-      }
-
+      const result = await lanceGraphRepo.getNodeStatsColumns(dataset);
       return c.json(result);
     } catch {
       return c.json({ error: "Node link stats not found for dataset" }, 404);
@@ -74,31 +48,22 @@ export const graphRoutes = new Hono()
             .filter((value): value is number => value !== null)
         : [];
 
-      let filtered;
-      if (indices.length > 0) {
-        const result = await lanceGraphRepo.getEdgesByIndices(dataset, indices, {
-          edgeKinds,
-          includeExternal,
-        });
-        filtered = result.edges;
-      } else {
-        let edges = await lanceGraphRepo.getEdges(dataset, edgeKinds);
-        if (!includeExternal) {
-          edges = edges.filter((edge) => edge.dst_ls_index !== null);
-        }
-        filtered = edges;
-      }
-
       const maxEdgesRaw = normalizeIndex(payload.max_edges);
       const maxEdges = maxEdgesRaw && maxEdgesRaw > 0 ? maxEdgesRaw : 5000;
-      const total = filtered.length;
-      const out = filtered.slice(0, maxEdges);
+
+      // Empty indices match everything; the repo caps conversion at maxEdges
+      // while still counting the full match total.
+      const { edges, total } = await lanceGraphRepo.getEdgesByIndices(dataset, indices, {
+        edgeKinds,
+        includeExternal,
+        maxEdges,
+      });
 
       return c.json({
-        edges: out,
+        edges,
         total,
-        returned: out.length,
-        truncated: total > out.length,
+        returned: edges.length,
+        truncated: total > edges.length,
       });
     } catch {
       return c.json({ error: "Links graph not found for dataset" }, 404);
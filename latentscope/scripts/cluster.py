@@ -183,6 +183,7 @@ def clusterer(dataset_id, umap_id, samples, min_samples, cluster_selection_epsil
         json.dump(default_labels_meta, f, indent=2)
 
     print("done with", cluster_id)
+    return cluster_id
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -204,6 +204,7 @@ def embed(dataset_id, text_column, model_id, prefix, rerun, dimensions, batch_si
 
     # np.save(os.path.join(embedding_dir, f"{embedding_id}.npy"), np_embeds)
     print("done with", embedding_id)
+    return embedding_id
 
 def truncate():
     parser = argparse.ArgumentParser(description='Make a copy of an existing embedding truncated to a smaller number of dimensions')
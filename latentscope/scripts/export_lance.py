@@ -2,6 +2,7 @@
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 
 def export_lance(directory, dataset, scope_id, metric="cosine", partitions=None, cloud=False):
@@ -35,8 +36,13 @@ def export_lance(directory, dataset, scope_id, metric="cosine", partitions=None,
         print(f"SAE scope detected, adding metadata")
         sae_path = os.path.join(dataset_path, "saes", f"{scope_meta['sae_id']}.h5")
         with h5py.File(sae_path, 'r') as f:
-            all_top_indices = np.array(f["top_indices"])
-            all_top_acts = np.array(f["top_acts"])
+            # HDF5 reads release the GIL, so the two dataset reads can overlap;
+            # reading with [:] also skips the extra np.array() copy.
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                indices_future = pool.submit(f["top_indices"].__getitem__, slice(None))
+                acts_future = pool.submit(f["top_acts"].__getitem__, slice(None))
+                all_top_indices = indices_future.result()
+                all_top_acts = acts_future.result()
 
         scope_df["sae_indices"] = [row.tolist() for row in all_top_indices]
         scope_df["sae_acts"] = [row.tolist() for row in all_top_acts]
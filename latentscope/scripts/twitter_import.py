@@ -31,20 +31,24 @@ from latentscope.util import get_data_dir
 
 
 def _latest_id(directory: str, pattern: str) -> str:
-    matches = [name for name in os.listdir(directory) if re.match(pattern, name)]
-    if not matches:
+    # Single scandir pass with a running max; no need to collect and sort
+    # every match just to take the last one.
+    matcher = re.compile(pattern).match
+    with os.scandir(directory) as entries:
+        latest = max((entry.name for entry in entries if matcher(entry.name)), default=None)
+    if latest is None:
         raise ValueError(f"No matching files in {directory} for pattern {pattern}")
-    matches.sort()
-    latest = matches[-1]
     return latest.rsplit(".", 1)[0]
 
 
 def _build_df(rows: list[dict[str, Any]]) -> pd.DataFrame:
     df = pd.DataFrame(rows)
-    # Drop rows that do not have required id/text fields.
-    df = df[df["id"].astype(str).str.len() > 0]
-    df = df[df["text"].astype(str).str.len() > 0]
-    df = df.reset_index(drop=True)
+    # Drop rows that do not have required id/text fields in one slice; the
+    # nullable string dtype keeps the length checks vectorized.
+    ids = df["id"].astype("string")
+    texts = df["text"].astype("string")
+    mask = (ids.str.len() > 0) & (texts.str.len() > 0)
+    df = df.loc[mask.fillna(False)].reset_index(drop=True)
     return df
 
 
@@ -714,8 +718,13 @@ def run_import(
                 summary["links_error"] = str(err)
         return summary
 
+    # Each stage returns the id it just wrote; _latest_id remains only as a
+    # fallback for stages that return None (e.g. aligned umap runs), since a
+    # directory scan picks the newest file, not necessarily ours, and races
+    # under concurrent imports.
+
     # 1) Embedding
-    embed(
+    new_embedding_id = embed(
         dataset_id=dataset_id,
         text_column=text_column,
         model_id=embedding_model,
@@ -727,10 +736,12 @@ def run_import(
     )
 
     dataset_dir = os.path.join(data_dir, dataset_id)
-    embedding_id = _latest_id(os.path.join(dataset_dir, "embeddings"), r"embedding-\d+\.json")
+    embedding_id = new_embedding_id or _latest_id(
+        os.path.join(dataset_dir, "embeddings"), r"embedding-\d+\.json"
+    )
 
     # 2a) Display UMAP (2D for visualization)
-    umapper(
+    new_umap_id = umapper(
         dataset_id=dataset_id,
         embedding_id=embedding_id,
         neighbors=umap_neighbors,
@@ -742,10 +753,10 @@ def run_import(
         purpose='display',
         n_components=2,
     )
-    umap_id = _latest_id(os.path.join(dataset_dir, "umaps"), r"umap-\d+\.json")
+    umap_id = new_umap_id or _latest_id(os.path.join(dataset_dir, "umaps"), r"umap-\d+\.json")
 
     # 2b) Clustering UMAP (kD for HDBSCAN)
-    umapper(
+    new_clustering_umap_id = umapper(
         dataset_id=dataset_id,
         embedding_id=embedding_id,
         neighbors=umap_neighbors,
@@ -757,10 +768,12 @@ def run_import(
         purpose='cluster',
         n_components=10,
     )
-    clustering_umap_id = _latest_id(os.path.join(dataset_dir, "umaps"), r"umap-\d+\.json")
+    clustering_umap_id = new_clustering_umap_id or _latest_id(
+        os.path.join(dataset_dir, "umaps"), r"umap-\d+\.json"
+    )
 
     # 3) Clustering (on kD manifold)
-    clusterer(
+    new_cluster_id = clusterer(
         dataset_id=dataset_id,
         umap_id=umap_id,
         samples=cluster_samples,
@@ -769,12 +782,14 @@ def run_import(
         column=None,
         clustering_umap_id=clustering_umap_id,
     )
-    cluster_id = _latest_id(os.path.join(dataset_dir, "clusters"), r"cluster-\d+\.json")
+    cluster_id = new_cluster_id or _latest_id(
+        os.path.join(dataset_dir, "clusters"), r"cluster-\d+\.json"
+    )
 
     # 4) Scope with default labels
     scope_label = f"{dataset_id} Twitter"
     scope_description = f"Imported from {imported.source} and auto-processed."
-    scope(
+    new_scope_id = scope(
         dataset_id=dataset_id,
         embedding_id=embedding_id,
         umap_id=umap_id,
@@ -785,7 +800,7 @@ def run_import(
         scope_id=None,
         sae_id=None,
     )
-    scope_id = _latest_id(os.path.join(dataset_dir, "scopes"), r"scopes-\d+\.json")
+    scope_id = new_scope_id or _latest_id(os.path.join(dataset_dir, "scopes"), r"scopes-\d+\.json")
 
     cluster_labels_id = "default"
     hierarchical_enabled = False
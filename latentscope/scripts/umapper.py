@@ -262,6 +262,7 @@ def umapper(dataset_id, embedding_id, neighbors=25, min_dist=0.1, save=False, in
             pickle.dump(reducer, f)
 
     print("done with", umap_id)
+    return umap_id
 
 def sparse_umapper(dataset_id, embedding_id, sae_id, neighbors=25, min_dist=0.1, save=False, init=None, seed=None):
     DATA_DIR = get_data_dir()
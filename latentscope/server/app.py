@@ -1,16 +1,26 @@
 import re
 import os
 import sys
+import atexit
 import json
 import math
 import h5py
+from functools import lru_cache
+import time
+import orjson
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import RLock, Thread
 import argparse
 import requests
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from importlib.resources import files
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
 from werkzeug.exceptions import RequestEntityTooLarge
 
@@ -58,9 +68,67 @@ READ_ONLY = check_read_only(os.getenv("LATENT_SCOPE_READ_ONLY")) or APP_MODE ==
 print("READ ONLY?", READ_ONLY)
 print("APP MODE?", APP_MODE)
 
-# in memory cache of dataframes loaded for each dataset
-# used in returning rows for a given index (indexed, get_tags)
-DATAFRAMES = {}
+# Bounded in-memory cache of input.parquet dataframes for each dataset.
+# Keyed on (dataset, mtime) so a re-ingested parquet is reloaded instead of
+# served stale; the LRU bound caps memory on servers hosting many datasets.
+DATAFRAME_CACHE_SIZE = _env_int("LATENT_SCOPE_DATAFRAME_CACHE", 8)
+
+@lru_cache(maxsize=DATAFRAME_CACHE_SIZE)
+def _load_df_cached(dataset, mtime):
+    path = os.path.join(DATA_DIR, dataset, "input.parquet")
+    # memory_map keeps the file in page cache instead of copying into the heap
+    return pd.read_parquet(path, engine="pyarrow", memory_map=True)
+
+def _load_df(dataset):
+    path = os.path.join(DATA_DIR, dataset, "input.parquet")
+    return _load_df_cached(dataset, os.path.getmtime(path))
+
+# Bounded cache of open read-only H5 file handles. Reopening per request
+# reparses HDF5 metadata and rebuilds the chunk cache; warm handles skip that
+# and keep a larger chunk cache so repeated row reads hit memory.
+H5_CACHE_SIZE = _env_int("LATENT_SCOPE_H5_CACHE", 32)
+_H5_FILES = OrderedDict()  # path -> (mtime, h5py.File)
+_H5_LOCK = RLock()
+
+def _open_h5(path):
+    mtime = os.path.getmtime(path)
+    with _H5_LOCK:
+        entry = _H5_FILES.get(path)
+        if entry is not None:
+            if entry[0] == mtime:
+                _H5_FILES.move_to_end(path)
+                return entry[1]
+            # file was rewritten; drop the stale handle
+            entry[1].close()
+            del _H5_FILES[path]
+        handle = h5py.File(path, 'r', rdcc_nbytes=32 * 1024 * 1024, rdcc_nslots=10007)
+        _H5_FILES[path] = (mtime, handle)
+        while len(_H5_FILES) > H5_CACHE_SIZE:
+            _, (_, evicted) = _H5_FILES.popitem(last=False)
+            evicted.close()
+        return handle
+
+@atexit.register
+def _close_h5_files():
+    with _H5_LOCK:
+        for _, handle in _H5_FILES.values():
+            handle.close()
+        _H5_FILES.clear()
+
+def _read_h5_rows(dset, indices):
+    """
+    Read the given rows from an H5 dataset, returned in the order of `indices`.
+    HDF5 requires fancy selections in sorted order, so read sorted into a
+    single preallocated buffer and undo the permutation afterwards.
+    """
+    npvi = np.asarray(indices)
+    order = np.argsort(npvi, kind="stable")
+    # build the inverse permutation directly instead of a second argsort
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(order.size)
+    out = np.empty((len(npvi),) + dset.shape[1:], dtype=dset.dtype)
+    dset.read_direct(out, source_sel=np.s_[npvi[order]])
+    return out[inverse]
 
 from .jobs import jobs_bp, jobs_write_bp
 app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
@@ -81,13 +149,116 @@ if APP_MODE == "studio":
 if(not READ_ONLY):
     app.register_blueprint(datasets_write_bp, url_prefix='/api/datasets')
 
+def _warmup_datasets():
+    # Pre-load dataframes so the first query against a warm dataset doesn't
+    # pay the parquet read under the request timeout. Datasets come from
+    # $LATENT_SCOPE_WARMUP (comma separated) or the most recently accessed
+    # input.parquet files.
+    names = os.getenv("LATENT_SCOPE_WARMUP")
+    if names:
+        datasets = [d.strip() for d in names.split(",") if d.strip()]
+    else:
+        candidates = []
+        for dir in os.listdir(DATA_DIR):
+            path = os.path.join(DATA_DIR, dir, "input.parquet")
+            if os.path.isfile(path):
+                candidates.append((os.path.getatime(path), dir))
+        candidates.sort(reverse=True)
+        datasets = [d for _, d in candidates[:max(1, DATAFRAME_CACHE_SIZE // 2)]]
+    for dataset in datasets:
+        try:
+            _load_df(dataset)
+            app.logger.info("warmed up dataset %s", dataset)
+        except Exception as err:
+            app.logger.info("warmup skipped %s: %s", dataset, err)
+
+Thread(target=_warmup_datasets, daemon=True).start()
+
 # ===========================================================
 # URL Resolution for t.co links (Twitter/X media embedding)
 # Used for lazy-loading media/quotes when cards become visible
 # ===========================================================
 
+class _TTLCache:
+    """
+    Minimal thread-safe size + TTL bounded mapping (stdlib-only stand-in for
+    cachetools.TTLCache). Bounds memory on long-running hosted servers and
+    lets moved redirect targets be re-resolved after the TTL expires.
+    """
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = RLock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._data[key]
+                return default
+            return value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = (time.time() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
 # Cache for resolved URLs to avoid repeated lookups
-URL_CACHE = {}
+URL_CACHE = _TTLCache(maxsize=100_000, ttl=24 * 3600)
+
+# Shared session with a pooled adapter so batch resolution reuses keep-alive
+# connections instead of paying a TCP+TLS handshake per URL.
+_URL_SESSION = requests.Session()
+_url_adapter = requests.adapters.HTTPAdapter(pool_connections=64, pool_maxsize=64)
+_URL_SESSION.mount("https://", _url_adapter)
+_URL_SESSION.mount("http://", _url_adapter)
+
+RESOLVE_MAX_WORKERS = _env_int("LATENT_SCOPE_RESOLVE_WORKERS", 16)
+
+# Compiled once; matching and tweet-id capture happen in a single pass.
+_TWEET_STATUS_RE = re.compile(r'https?://(?:twitter\.com|x\.com)/\w+/status/(\d+)')
+_IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+
+def _classify(final_url):
+    """Classify a resolved URL, returning (content_type, media_url)."""
+    if "pbs.twimg.com/media" in final_url:
+        return "image", final_url
+    if "video.twimg.com" in final_url:
+        return "video", final_url
+    match = _TWEET_STATUS_RE.match(final_url)
+    if match:
+        return "quote", match.group(1)  # Just the tweet ID
+    if final_url.endswith(_IMAGE_SUFFIXES):
+        return "image", final_url
+    return "external", None
+
+
+def _resolve_one(url):
+    """
+    Follow redirects for a single shortened URL and classify the destination.
+    Raises requests.RequestException on network failure.
+    """
+    response = _URL_SESSION.head(url, allow_redirects=True, timeout=5)
+    final_url = response.url
+    content_type, media_url = _classify(final_url)
+
+    return {
+        "original": url,
+        "final": final_url,
+        "type": content_type,
+        "media_url": media_url
+    }
 
 
 @app.errorhandler(RequestEntityTooLarge)
@@ -107,40 +278,12 @@ def resolve_url():
         return jsonify(error="No URL provided"), 400
 
     # Check cache first
-    if url in URL_CACHE:
-        return jsonify(URL_CACHE[url])
+    cached = URL_CACHE.get(url)
+    if cached is not None:
+        return jsonify(cached)
 
     try:
-        # Follow redirects to get final URL
-        response = requests.head(url, allow_redirects=True, timeout=5)
-        final_url = response.url
-
-        # Determine content type based on URL pattern
-        content_type = "external"
-        media_url = None
-
-        if "pbs.twimg.com/media" in final_url:
-            content_type = "image"
-            media_url = final_url
-        elif "video.twimg.com" in final_url:
-            content_type = "video"
-            media_url = final_url
-        elif re.match(r'https?://(twitter\.com|x\.com)/\w+/status/\d+', final_url):
-            content_type = "quote"
-            # Extract tweet ID from URL
-            match = re.search(r'/status/(\d+)', final_url)
-            if match:
-                media_url = match.group(1)  # Just the tweet ID
-        elif final_url.endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp')):
-            content_type = "image"
-            media_url = final_url
-
-        result = {
-            "original": url,
-            "final": final_url,
-            "type": content_type,
-            "media_url": media_url
-        }
+        result = _resolve_one(url)
 
         # Cache the result
         URL_CACHE[url] = result
@@ -158,44 +301,29 @@ def resolve_urls():
     data = request.get_json()
     urls = data.get('urls', [])
 
+    # Resolve uncached URLs in parallel; HEAD requests are pure I/O so the
+    # thread pool hides per-URL round-trip latency.
+    uncached = [url for url in dict.fromkeys(urls) if url not in URL_CACHE]
+    resolved = {}
+    if uncached:
+        with ThreadPoolExecutor(max_workers=min(RESOLVE_MAX_WORKERS, len(uncached))) as executor:
+            futures = {executor.submit(_resolve_one, url): url for url in uncached}
+            for future in futures:
+                url = futures[future]
+                try:
+                    result = future.result()
+                    URL_CACHE[url] = result
+                    resolved[url] = result
+                except requests.RequestException:
+                    resolved[url] = {"original": url, "error": True}
+
     results = []
     for url in urls:
-        if url in URL_CACHE:
-            results.append(URL_CACHE[url])
+        cached = URL_CACHE.get(url)
+        if cached is not None:
+            results.append(cached)
         else:
-            try:
-                response = requests.head(url, allow_redirects=True, timeout=5)
-                final_url = response.url
-
-                content_type = "external"
-                media_url = None
-
-                if "pbs.twimg.com/media" in final_url:
-                    content_type = "image"
-                    media_url = final_url
-                elif "video.twimg.com" in final_url:
-                    content_type = "video"
-                    media_url = final_url
-                elif re.match(r'https?://(twitter\.com|x\.com)/\w+/status/\d+', final_url):
-                    content_type = "quote"
-                    match = re.search(r'/status/(\d+)', final_url)
-                    if match:
-                        media_url = match.group(1)
-                elif final_url.endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp')):
-                    content_type = "image"
-                    media_url = final_url
-
-                result = {
-                    "original": url,
-                    "final": final_url,
-                    "type": content_type,
-                    "media_url": media_url
-                }
-                URL_CACHE[url] = result
-                results.append(result)
-
-            except requests.RequestException:
-                results.append({"original": url, "error": True})
+            results.append(resolved.get(url, {"original": url, "error": True}))
 
     return jsonify(results=results)
 
@@ -207,10 +335,21 @@ def resolve_urls():
 """
 Allow fetching of dataset files directly from disk
 """
+# When set, large file bytes are served by the reverse proxy (nginx
+# internal location mapped to DATA_DIR) instead of streaming through Flask.
+# export LATENT_SCOPE_XSENDFILE=/_internal_data
+XSENDFILE_PREFIX = os.getenv("LATENT_SCOPE_XSENDFILE")
+
 @app.route('/api/files/<path:datasetPath>', methods=['GET'])
 def send_file(datasetPath):
     print("req url", request.url)
-    return send_from_directory(DATA_DIR, datasetPath)
+    if XSENDFILE_PREFIX:
+        response = Response()
+        response.headers["X-Accel-Redirect"] = f"{XSENDFILE_PREFIX}/{datasetPath}"
+        return response
+    # conditional=True enables Range and If-Modified-Since handling so
+    # clients can resume / revalidate large parquet and h5 files
+    return send_from_directory(DATA_DIR, datasetPath, conditional=True)
 
 """
 Given a list of indices (passed as a json array), return the rows from the dataset
@@ -224,11 +363,7 @@ def indexed():
     columns = data.get('columns')
     embedding_id = data.get('embedding_id')
 
-    if dataset not in DATAFRAMES:
-        df = pd.read_parquet(os.path.join(DATA_DIR, dataset, "input.parquet"))
-        DATAFRAMES[dataset] = df
-    else:
-        df = DATAFRAMES[dataset]
+    df = _load_df(dataset)
 
     if columns:
         df = df[columns]
@@ -238,51 +373,57 @@ def indexed():
     if not isinstance(indices, list):
         indices = [indices]
 
-    def normalize_index(value):
-        if value is None or isinstance(value, bool):
-            return None
-
-        if isinstance(value, (int, np.integer)):
-            return int(value)
-
-        if isinstance(value, float):
-            if math.isfinite(value) and value.is_integer():
-                return int(value)
-            return None
-
-        if isinstance(value, str):
-            stripped = value.strip()
-            if not stripped:
-                return None
-            try:
-                parsed = float(stripped)
-            except ValueError:
-                return None
-            if math.isfinite(parsed) and parsed.is_integer():
-                return int(parsed)
-            return None
-
-        return None
-
-    # get the indexed rows, handling null/invalid/missing indices
-    valid_indices = [
-        idx for idx in (normalize_index(i) for i in indices)
-        if idx is not None and 0 <= idx < len(df)
-    ]
-    rows = df.iloc[valid_indices].copy()
-    rows['index'] = valid_indices
+    # Normalize null/invalid/missing indices in one vectorized pass instead of
+    # per-element isinstance checks. Booleans parse as 0/1 numerically, so
+    # screen them out first.
+    candidates = [i for i in indices if not isinstance(i, bool)]
+    numeric = pd.to_numeric(
+        pd.Series(candidates, dtype="object"), errors="coerce"
+    ).to_numpy(dtype="float64", na_value=np.nan)
+    with np.errstate(invalid="ignore"):
+        valid_mask = (
+            np.isfinite(numeric)
+            & (numeric == np.floor(numeric))
+            & (numeric >= 0)
+            & (numeric < len(df))
+        )
+    valid_indices = numeric[valid_mask].astype(np.int64)
+    # iloc with a list already returns a new frame, no defensive copy needed
+    rows = df.iloc[valid_indices]
+    rows = rows.assign(index=valid_indices)
 
     if embedding_id:
         embedding_path = os.path.join(DATA_DIR, dataset, "embeddings", f"{embedding_id}.h5")
-        with h5py.File(embedding_path, 'r') as f:
-            npvi = np.array(valid_indices)
-            sorted_indices = np.argsort(npvi)
-            sorted_embeddings = np.array(f["embeddings"][npvi[sorted_indices]])
-            filtered_embeddings = sorted_embeddings[np.argsort(sorted_indices)]
+        f = _open_h5(embedding_path)
+        filtered_embeddings = _read_h5_rows(f["embeddings"], valid_indices)
         rows['ls_embedding'] = filtered_embeddings
 
-    # send back the rows as json
-    return rows.to_json(orient="records")
+    # send back the rows as json (already serialized by pandas, no re-parse)
+    return Response(rows.to_json(orient="records"), mimetype="application/json")
+
+def _filter_mask(column, f):
+    """Evaluate a single filter against an Arrow column, returning a boolean array."""
+    ftype = f["type"]
+    value = f["value"]
+    if ftype == "eq":
+        return pc.equal(column, value)
+    if ftype == "gt":
+        return pc.greater(column, value)
+    if ftype == "lt":
+        return pc.less(column, value)
+    if ftype == "gte":
+        return pc.greater_equal(column, value)
+    if ftype == "lte":
+        return pc.less_equal(column, value)
+    if ftype == "in":
+        return pc.is_in(column, value_set=pa.array(value))
+    if ftype == "contains":
+        # Literal SIMD substring match by default; Arrow compiles the regex
+        # variant once per call rather than per row.
+        if f.get("regex"):
+            return pc.match_substring_regex(column, value)
+        return pc.match_substring(column, value)
+    return None
 
 @app.route('/api/column-filter', methods=['POST'])
 def column_filter():
@@ -290,34 +431,31 @@ def column_filter():
     dataset = data['dataset']
     filters = data['filters']
 
-    if dataset not in DATAFRAMES:
-        df = pd.read_parquet(os.path.join(DATA_DIR, dataset, "input.parquet"))
-        DATAFRAMES[dataset] = df
-    else:
-        df = DATAFRAMES[dataset]
-    
-    # apply filters
-    rows = df.copy()
+    path = os.path.join(DATA_DIR, dataset, "input.parquet")
 
     print("FILTERS", filters)
-    if filters:
-        for f in filters:
-            if f["type"] == "eq":
-                rows = rows[rows[f['column']] == f['value']]
-            elif f["type"] == "gt":
-                rows = rows[rows[f['column']] > f['value']]
-            elif f["type"] == "lt":
-                rows = rows[rows[f['column']] < f['value']]
-            elif f["type"] == "gte":
-                rows = rows[rows[f['column']] >= f['value']]
-            elif f["type"] == "lte":
-                rows = rows[rows[f['column']] <= f['value']]
-            elif f["type"] == "in":
-                rows = rows[rows[f['column']].isin(f['value'])]
-            elif f["type"] == "contains":
-                rows = rows[rows[f['column']].str.contains(f['value'])]
-
-    return jsonify(indices=rows.index.to_list())
+    if not filters:
+        num_rows = pq.read_metadata(path).num_rows
+        return jsonify(indices=list(range(num_rows)))
+
+    # Only read the columns referenced by the filters; Arrow's compute kernels
+    # evaluate the masks without materializing the rest of the dataset.
+    filter_columns = list({f['column'] for f in filters})
+    table = pq.read_table(path, columns=filter_columns, memory_map=True)
+
+    combined = None
+    for f in filters:
+        mask = _filter_mask(table.column(f['column']), f)
+        if mask is None:
+            continue
+        combined = mask if combined is None else pc.and_kleene(combined, mask)
+
+    if combined is None:
+        return jsonify(indices=list(range(table.num_rows)))
+
+    combined = pc.fill_null(combined, False)
+    indices = np.flatnonzero(combined.to_numpy(zero_copy_only=False))
+    return jsonify(indices=indices.tolist())
 
 @app.route('/api/query', methods=['POST'])
 def query():
@@ -331,62 +469,73 @@ def query():
 
     # filters = data['filters'] if 'filters' in data else None
     sort = data['sort'] if 'sort' in data else None
-    if dataset not in DATAFRAMES:
-        df = pd.read_parquet(os.path.join(DATA_DIR, dataset, "input.parquet"))
-        DATAFRAMES[dataset] = df
-    else:
-        df = DATAFRAMES[dataset]
-    
-    # apply filters
-    rows = df.copy()
-    rows['ls_index'] = rows.index
+    df = _load_df(dataset)
 
+    # select columns and rows as views; the row index carries ls_index so the
+    # column itself is only materialized on the final page
     if columns:
-        safe_columns = [col for col in columns if col in rows.columns]
-        if 'ls_index' not in safe_columns:
-            safe_columns.append('ls_index')
-        rows = rows[safe_columns]
-    
+        safe_columns = [col for col in columns if col in df.columns]
+        rows = df[safe_columns]
+    else:
+        rows = df
 
-    # get the indexed rows
+    # get the indexed rows; indices are positional, so iloc avoids the
+    # label-alignment lookup .loc would do on every request
     if len(indices):
-        rows = rows.loc[indices]
+        rows = rows.iloc[np.asarray(indices, dtype=np.int64)]
 
     # # only get the first 5 columns
     # cols = 5
     # rows = rows.iloc[:, :cols]
 
-    if embedding_id:
-        embedding_path = os.path.join(DATA_DIR, dataset, "embeddings", f"{embedding_id}.h5")
-        with h5py.File(embedding_path, 'r') as f:
-            npvi = np.array(rows.index)
-            sorted_indices = np.argsort(npvi)
-            sorted_embeddings = np.array(f["embeddings"][npvi[sorted_indices]])
-            filtered_embeddings = sorted_embeddings[np.argsort(sorted_indices)]
-        # Add the filtered embeddings as a new column to the rows DataFrame
-        rows['ls_embedding'] = filtered_embeddings.tolist()
-
     # print("ROWS", rows.head())
     # apply sort
     if sort:
-        rows = rows.sort_values(by=sort['column'], ascending=sort['ascending'])
-
-    # Convert DataFrame to a list of dictionaries
-    rows_json = json.loads(rows[page*per_page:page*per_page+per_page].to_json(orient="records"))
+        if sort['column'] == 'ls_index':
+            # ls_index lives on the row index until the final page is built
+            rows = rows.sort_index(ascending=sort['ascending'])
+        else:
+            rows = rows.sort_values(by=sort['column'], ascending=sort['ascending'])
 
-    # only send back the first per_page rows
-    # per_page = 100
-    # rows_json = rows_json[:per_page]
+    # paginate before any H5 reads so embeddings are only fetched for the
+    # rows actually returned, not the whole filtered set
+    page_rows = rows[page*per_page:page*per_page+per_page]
+    page_rows = page_rows.assign(ls_index=page_rows.index)
 
-    # send back the rows as json
-    return jsonify({
-        "rows": rows_json,
+    if embedding_id:
+        embedding_path = os.path.join(DATA_DIR, dataset, "embeddings", f"{embedding_id}.h5")
+        f = _open_h5(embedding_path)
+        filtered_embeddings = _read_h5_rows(f["embeddings"], page_rows.index)
+        # Add the filtered embeddings as a new column (assign avoids mutating a view)
+        page_rows = page_rows.assign(ls_embedding=filtered_embeddings.tolist())
+
+    # Serialize in chunks: splice pandas-produced rows JSON into the envelope
+    # a few rows at a time instead of buffering the whole payload, so first
+    # bytes reach the client before embedding-heavy pages finish serializing.
+    meta_bytes = orjson.dumps({
         "page": page,
         "per_page": per_page,
         "total": len(rows),
         "totalPages": math.ceil(len(rows) / per_page)
     })
 
+    def generate(chunk_size=20):
+        yield b'{"rows":['
+        emitted = False
+        for start in range(0, len(page_rows), chunk_size):
+            chunk = page_rows.iloc[start:start + chunk_size]
+            # strip the surrounding [ ] so chunks concatenate into one array
+            body = chunk.to_json(orient="records").encode("utf-8")[1:-1]
+            if not body:
+                continue
+            if emitted:
+                yield b','
+            emitted = True
+            yield body
+        yield b'],' + meta_bytes[1:]
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
+
 @app.route('/api/version', methods=['GET'])
 def get_version():
     print("GET VERSION", __version__)
@@ -2,14 +2,71 @@ import os
 import re
 import json
 import fnmatch
+import orjson
 import pandas as pd
-from flask import Blueprint, jsonify, request
+import pyarrow as pa
+import pyarrow.parquet as pq
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 # Create a Blueprint
 datasets_bp = Blueprint('datasets_bp', __name__)
 datasets_write_bp = Blueprint('datasets_write_bp', __name__)
 DATA_DIR = os.getenv('LATENT_SCOPE_DATA')
 
+# Parsed metadata JSON keyed by path; re-read only when (mtime_ns, size)
+# changes so repeated requests skip disk reads and JSON parsing.
+_META_CACHE = {}
+
+def _load_json_cached(file_path):
+    stat = os.stat(file_path)
+    stat_key = (stat.st_mtime_ns, stat.st_size)
+    cached = _META_CACHE.get(file_path)
+    if cached is not None and cached[0] == stat_key:
+        return cached[1]
+    with open(file_path, 'rb') as json_file:
+        json_contents = orjson.loads(json_file.read())
+    _META_CACHE[file_path] = (stat_key, json_contents)
+    return json_contents
+
+# re's internal pattern cache gets evicted by the dataset-specific patterns
+# used in labels_available; keep our own compiled copies around.
+@lru_cache(maxsize=128)
+def _compile(pattern):
+    return re.compile(pattern)
+
+def _ojsonify(payload):
+    # orjson serializes list/dict payloads in a single C pass; numpy scalars
+    # from parquet-derived values are handled natively.
+    return Response(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+        mimetype="application/json",
+    )
+
+def _stream_df_json(df, chunk=4096):
+    """Stream a dataframe as a JSON records array in chunks.
+
+    Serializing the whole frame with df.to_json doubles peak memory
+    (dataframe + full string) and delays the first byte until the end;
+    chunked serialization pipelines the work instead.
+    """
+    def generate():
+        yield b"["
+        first = True
+        for start in range(0, len(df), chunk):
+            # to_json handles NaN/timestamps the same way the unchunked
+            # response did; strip the outer brackets and stitch with commas.
+            buf = df.iloc[start:start + chunk].to_json(orient="records").encode("utf-8")[1:-1]
+            if not buf:
+                continue
+            if not first:
+                yield b","
+            yield buf
+            first = False
+        yield b"]"
+    return Response(stream_with_context(generate()), mimetype="application/json")
+
 
 
 """
@@ -18,52 +75,67 @@ Essential metadata is stored in meta.json
 """
 @datasets_bp.route('/', methods=['GET'])
 def get_datasets():
-    datasets = []
+    candidates = []
+    # scandir's cached entry type skips the stat on stray files in DATA_DIR
+    with os.scandir(DATA_DIR) as it:
+        for entry in it:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            file_path = os.path.join(entry.path, 'meta.json')
+            if os.path.isfile(file_path):
+                candidates.append((entry.name, file_path))
+
+    def load(candidate):
+        dir, file_path = candidate
+        try:
+            # copy before tagging the id so the cached dict stays pristine
+            return dict(_load_json_cached(file_path), id=dir)
+        except Exception:
+            print("Error reading meta.json", file_path)
+            return None
 
-    for dir in os.listdir(DATA_DIR):
-        file_path = os.path.join(DATA_DIR, dir, 'meta.json')
-        if os.path.isfile(file_path):
-            with open(file_path, 'r', encoding='utf-8') as file:
-                try:
-                    jsonData = json.load(file)
-                    jsonData['id'] = dir
-                    datasets.append(jsonData)
-                except:
-                    print("Error reading meta.json", file_path)
+    datasets = []
+    if candidates:
+        # The cold path is IO-bound (one open+read per dataset); overlap the
+        # reads. Warm reads come straight out of _META_CACHE.
+        with ThreadPoolExecutor(max_workers=min(16, len(candidates))) as pool:
+            datasets = [d for d in pool.map(load, candidates) if d is not None]
 
     datasets.sort(key=lambda x: x.get('id'))
-    return jsonify(datasets)
+    return _ojsonify(datasets)
 
 """
 Get all metadata files from the given a directory.
 """
 def scan_for_json_files(directory_path, match_pattern=r".*\.json$"):
     try:
-        # files = os.listdir(directory_path)
-        files = sorted(os.listdir(directory_path), key=lambda x: os.path.getmtime(os.path.join(directory_path, x)), reverse=True)
+        # scandir hands back cached stat results, so sorting by mtime costs
+        # one syscall per entry instead of a listdir + getmtime pair.
+        with os.scandir(directory_path) as it:
+            entries = [(entry.name, entry.stat().st_mtime_ns) for entry in it if entry.is_file()]
+        entries.sort(key=lambda e: e[1], reverse=True)
+        files = [name for name, _ in entries]
     except OSError as err:
         print('Unable to scan directory:', err)
         return jsonify({"error": "Unable to scan directory"}), 500
 
-    json_files = [file for file in files if re.match(match_pattern, file)]
+    rx = _compile(match_pattern)
+    json_files = [file for file in files if rx.match(file)]
     # print("files", files)
     # print("json", json_files)
 
     json_contents = []
     for file in json_files:
         try:
-            with open(os.path.join(directory_path, file), 'r', encoding='utf-8') as json_file:
-                json_contents.append(json.load(json_file))
-        except json.JSONDecodeError as err:
+            json_contents.append(_load_json_cached(os.path.join(directory_path, file)))
+        except (OSError, ValueError) as err:
             print('Error parsing JSON string:', err)
-    return jsonify(json_contents)
+    return _ojsonify(json_contents)
 
 @datasets_bp.route('/<dataset>/meta', methods=['GET'])
 def get_dataset_meta(dataset):
     file_path = os.path.join(DATA_DIR, dataset, "meta.json")
-    with open(file_path, 'r', encoding='utf-8') as json_file:
-        json_contents = json.load(json_file)
-    return jsonify(json_contents)
+    return _ojsonify(_load_json_cached(file_path))
 
 @datasets_write_bp.route('/<dataset>/meta/update', methods=['GET'])
 def update_dataset_meta(dataset):
@@ -93,9 +165,7 @@ def get_dataset_embeddings(dataset):
 @datasets_bp.route('/<dataset>/embeddings/<embedding>', methods=['GET'])
 def get_dataset_embedding(dataset, embedding):
     file_path = os.path.join(DATA_DIR, dataset, "embeddings", embedding + ".json")
-    with open(file_path, 'r', encoding='utf-8') as json_file:
-        json_contents = json.load(json_file)
-    return jsonify(json_contents)
+    return _ojsonify(_load_json_cached(file_path))
 
 @datasets_bp.route('/<dataset>/umaps', methods=['GET'])
 def get_dataset_umaps(dataset):
@@ -105,15 +175,13 @@ def get_dataset_umaps(dataset):
 @datasets_bp.route('/<dataset>/umaps/<umap>', methods=['GET'])
 def get_dataset_umap(dataset, umap):
     file_path = os.path.join(DATA_DIR, dataset, "umaps", umap + ".json")
-    with open(file_path, 'r', encoding='utf-8') as json_file:
-        json_contents = json.load(json_file)
-    return jsonify(json_contents)
+    return _ojsonify(_load_json_cached(file_path))
 
 @datasets_bp.route('/<dataset>/umaps/<umap>/points', methods=['GET'])
 def get_dataset_umap_points(dataset, umap):
     file_path = os.path.join(DATA_DIR, dataset, "umaps", umap + ".parquet")
     df = pd.read_parquet(file_path)
-    return df.to_json(orient="records")
+    return _stream_df_json(df)
 
 @datasets_bp.route('/<dataset>/clusters', methods=['GET'])
 def get_dataset_clusters(dataset):
@@ -123,9 +191,7 @@ def get_dataset_clusters(dataset):
 @datasets_bp.route('/<dataset>/clusters/<cluster>', methods=['GET'])
 def get_dataset_cluster(dataset, cluster):
     file_path = os.path.join(DATA_DIR, dataset, "clusters", cluster + ".json")
-    with open(file_path, 'r', encoding='utf-8') as json_file:
-        json_contents = json.load(json_file)
-    return jsonify(json_contents)
+    return _ojsonify(_load_json_cached(file_path))
 
 # @datasets_bp.route('/<dataset>/clusters/<cluster>/labels', methods=['GET'])
 # def get_dataset_cluster_labels_default(dataset, cluster):
@@ -139,7 +205,7 @@ def get_dataset_cluster_indices(dataset, cluster):
     file_name = cluster + ".parquet"
     file_path = os.path.join(DATA_DIR, dataset, "clusters", file_name)
     df = pd.read_parquet(file_path)
-    return df.to_json(orient="records")
+    return _stream_df_json(df)
 
 @datasets_bp.route('/<dataset>/clusters/<cluster>/labels/<id>', methods=['GET'])
 def get_dataset_cluster_labels(dataset, cluster, id):
@@ -148,8 +214,13 @@ def get_dataset_cluster_labels(dataset, cluster, id):
     file_name = cluster + "-labels-" + id + ".parquet"
     file_path = os.path.join(DATA_DIR, dataset, "clusters", file_name)
     df = pd.read_parquet(file_path)
-    df.reset_index(inplace=True)
-    return df.to_json(orient="records")
+    # Record construction through Arrow's C++ to_pylist plus orjson beats
+    # pandas' json writer, and prepending the index as a column avoids the
+    # reset_index reallocation. Label frames are small enough to serialize
+    # in one shot rather than streaming.
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.add_column(0, "index", pa.array(df.index.to_numpy()))
+    return _ojsonify(table.to_pylist())
 
 # This was rewritten in bulk.py to only affect a scope
 # @datasets_write_bp.route('/<dataset>/clusters/<cluster>/labels/<id>/label/<index>', methods=['GET'])
@@ -193,7 +264,8 @@ def get_dataset_cluster_labels_available(dataset, cluster):
 
 def get_next_scopes_number(dataset):
     # figure out the latest scope number
-    scopes_files = [f for f in os.listdir(os.path.join(DATA_DIR,dataset,"scopes")) if re.match(r"scopes-\d+\.json", f)]
+    rx = _compile(r"scopes-\d+\.json")
+    scopes_files = [f for f in os.listdir(os.path.join(DATA_DIR,dataset,"scopes")) if rx.match(f)]
     if len(scopes_files) > 0:
         last_scopes = sorted(scopes_files)[-1]
         last_scopes_number = int(last_scopes.split("-")[1].split(".")[0])
@@ -212,9 +284,7 @@ def get_dataset_scopes(dataset):
 def get_dataset_scope(dataset, scope):
     directory_path = os.path.join(DATA_DIR, dataset, "scopes")
     file_path = os.path.join(directory_path, scope + ".json")
-    with open(file_path, 'r', encoding='utf-8') as json_file:
-        json_contents = json.load(json_file)
-    return jsonify(json_contents)
+    return _ojsonify(_load_json_cached(file_path))
 
 @datasets_bp.route('/<dataset>/scopes/<scope>/parquet', methods=['GET'])
 def get_dataset_scope_parquet(dataset, scope):
@@ -249,19 +319,33 @@ def get_dataset_scope_parquet(dataset, scope):
         "is_reply",
     ]
 
+    # Only these columns ever make it into the response; project them at the
+    # parquet decode layer so large text/body column chunks are never read.
+    wanted = set(required_columns + engagement_columns + ["index", "ls_index"])
+
+    def read_projected(path):
+        cols = [c for c in pq.read_schema(path).names if c in wanted]
+        table = pq.read_table(path, columns=cols or None, pre_buffer=True, use_threads=True)
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
     # Prefer the combined scope-input parquet when available so the frontend can
     # use engagement/date metadata for visualization logic (e.g. node sizing),
     # while still returning a compact payload (no full text/body fields).
     if os.path.exists(scope_input_file_path):
-        df = pd.read_parquet(scope_input_file_path)
+        df = read_projected(scope_input_file_path)
     else:
-        df = pd.read_parquet(scope_file_path)
+        df = read_projected(scope_file_path)
 
         # Backward-compatible fallback: older scopes may not have <scope>-input.parquet.
         # In that case, enrich from dataset input.parquet so node sizing and hover
         # metadata can still use engagement + recency fields.
         if os.path.exists(dataset_input_file_path) and "ls_index" in df.columns:
-            input_df = pd.read_parquet(dataset_input_file_path)
+            # Same projection idea for the enrichment source: only the join key
+            # and engagement columns are needed. pd.read_parquet keeps any
+            # stored pandas index so the reset_index fallback still works.
+            input_wanted = set(engagement_columns) | {"ls_index"}
+            input_cols = [c for c in pq.read_schema(dataset_input_file_path).names if c in input_wanted]
+            input_df = pd.read_parquet(dataset_input_file_path, columns=input_cols or None)
 
             # The canonical row id may live in the input index; normalize to ls_index.
             if "ls_index" not in input_df.columns:
@@ -269,13 +353,16 @@ def get_dataset_scope_parquet(dataset, scope):
                 if "index" in input_df.columns:
                     input_df = input_df.rename(columns={"index": "ls_index"})
 
-            input_keep_cols = ["ls_index"] + [
-                col for col in engagement_columns if col in input_df.columns
-            ]
+            present_cols = [col for col in engagement_columns if col in input_df.columns]
 
-            if "ls_index" in input_df.columns and len(input_keep_cols) > 1:
-                input_lookup = input_df[input_keep_cols]
-                df = df.merge(input_lookup, on="ls_index", how="left", sort=False)
+            if "ls_index" in input_df.columns and present_cols:
+                # Per-column Series.map against a dict keyed on ls_index —
+                # cheaper than a full merge (no type alignment / index reset)
+                # and allocates only the mapped columns.
+                key = input_df["ls_index"].to_numpy()
+                for col in present_cols:
+                    lookup = dict(zip(key, input_df[col].to_numpy()))
+                    df[col] = df["ls_index"].map(lookup)
 
     # Some scope-input parquet files carry source row ids in `index` (from
     # input.parquet reset_index) instead of `ls_index`. Normalize so frontend
@@ -292,7 +379,7 @@ def get_dataset_scope_parquet(dataset, scope):
     if selected_columns:
         df = df[selected_columns]
 
-    return df.to_json(orient="records")
+    return _stream_df_json(df)
 
 @datasets_write_bp.route('/<dataset>/scopes/<scope>/description', methods=['GET'])
 def overwrite_scope_description(dataset, scope):
@@ -337,30 +424,73 @@ def new_scope_cluster(dataset, scope):
     return jsonify({"success": True, "message": "Description updated successfully"})
 
 
+# Export file lists keyed by dataset; invalidated via directory mtimes, which
+# change whenever entries are added or removed. In-place rewrites of an
+# existing file keep its stale size until the next structural change — fine
+# for the export UI, which polls this list repeatedly.
+_EXPORT_LIST_CACHE = {}
+
+def _export_dir_key(directory_path):
+    key = []
+
+    def visit(root):
+        # match os.walk: a missing dataset dir yields an empty listing, and
+        # symlinked directories are not followed (a link cycle would recurse
+        # forever)
+        try:
+            key.append((root, os.stat(root).st_mtime_ns))
+            it = os.scandir(root)
+        except FileNotFoundError:
+            return
+        with it:
+            for entry in it:
+                if entry.is_dir() and entry.name != "jobs" and not entry.is_symlink():
+                    visit(entry.path)
+
+    visit(directory_path)
+    return tuple(key)
+
 @datasets_bp.route('/<dataset>/export/list', methods=['GET'])
 def get_dataset_export_list(dataset):
     directory_path = os.path.join(DATA_DIR, dataset)
     print("dataset", dataset, directory_path)
+
+    dir_key = _export_dir_key(directory_path)
+    cached = _EXPORT_LIST_CACHE.get(dataset)
+    if cached is not None and cached[0] == dir_key:
+        return _ojsonify(cached[1])
+
     # scan the directory for files and directories
     # then walk the directories to find all the files
     # then return the list of files
     file_list = []
-    for root, dirs, files in os.walk(directory_path):
-        if "jobs" in root:
-            continue
-        for file in files:
-            if file == ".DS_Store":
-                continue
-            if file.endswith('.lock') or file.endswith('.metadata'):
-                continue
-            full_path = os.path.join(root, file)
-            file_name = os.path.basename(full_path)
-            relative_path = os.path.relpath(full_path, directory_path)
-            directory = os.path.relpath(root, directory_path)
-            size = os.path.getsize(full_path)
-            file_list.append((file_name, directory, relative_path, full_path, size))
 
-    return jsonify(file_list)
+    def scan(root):
+        directory = os.path.relpath(root, directory_path)
+        try:
+            it = os.scandir(root)
+        except FileNotFoundError:
+            return
+        with it:
+            for entry in it:
+                if entry.is_dir():
+                    # like os.walk's default: symlinked dirs are neither
+                    # traversed (a link cycle would recurse forever) nor
+                    # listed as files
+                    if entry.name != "jobs" and not entry.is_symlink():
+                        scan(entry.path)
+                    continue
+                name = entry.name
+                if name == ".DS_Store" or name.endswith('.lock') or name.endswith('.metadata'):
+                    continue
+                relative_path = os.path.relpath(entry.path, directory_path)
+                # DirEntry caches the stat from the directory scan — no extra
+                # getsize syscall per file.
+                file_list.append((name, directory, relative_path, entry.path, entry.stat().st_size))
+
+    scan(directory_path)
+    _EXPORT_LIST_CACHE[dataset] = (dir_key, file_list)
+    return _ojsonify(file_list)
 
 @datasets_bp.route('/<dataset>/plot/<scope>/list', methods=['GET'])
 def get_dataset_plot_list(dataset, scope):
@@ -372,13 +502,14 @@ def get_dataset_plot_list(dataset, scope):
     # then walk the directories to find all the files
     # then return the list of files
     file_list = []
-    files = [f for f in os.listdir(directory_path) if os.path.isfile(os.path.join(directory_path, f))]
-    for file in files:
-        if not (file.endswith(".png") and scope in file):
-            continue
-        full_path = os.path.join(directory_path, file)
-        file_name = os.path.basename(full_path)
-        size = os.path.getsize(full_path)
-        file_list.append((file_name, full_path, size))
-
-    return jsonify(file_list)
+    # one scandir pass: the DirEntry carries the type check and the size,
+    # replacing the isfile + getsize stat pair per file
+    with os.scandir(directory_path) as it:
+        for entry in it:
+            if not (entry.name.endswith(".png") and scope in entry.name):
+                continue
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            file_list.append((entry.name, entry.path, entry.stat().st_size))
+
+    return _ojsonify(file_list)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import functools
 import shlex
-from typing import Iterable
+from typing import Any, Iterable, Mapping
 
 
 def truthy_flag(value: str | None, *, default: bool = False) -> bool:
@@ -10,11 +11,103 @@ def truthy_flag(value: str | None, *, default: bool = False) -> bool:
     return value.strip().lower() in ("1", "true", "yes", "on")
 
 
-def shell_join(parts: Iterable[str]) -> str:
+@functools.lru_cache(maxsize=512)
+def _shell_join_cached(parts: tuple[str, ...]) -> str:
     return " ".join(shlex.quote(part) for part in parts)
 
 
+def shell_join(parts: Iterable[str]) -> str:
+    # Reruns and repeated submissions quote the same argv over and over;
+    # shlex.quote is a pure-Python regex scan per part, so memoize whole argvs.
+    return _shell_join_cached(tuple(parts))
+
+
 def falsy_flag(value: str | None) -> bool:
     if value is None:
         return False
     return value.strip().lower() in ("0", "false", "no", "off")
+
+
+# Declarative argv tables: (request arg name, CLI flag or None for positional,
+# always). `always` entries are emitted unconditionally with the legacy str()
+# coercion; the rest are skipped when missing or empty.
+ArgSpec = tuple[str, str | None, bool]
+
+EMBED_SPEC: list[ArgSpec] = [
+    ("dataset", None, True),
+    ("text_column", None, True),
+    ("model_id", None, True),
+    ("prefix", "--prefix", True),
+    ("batch_size", "--batch_size", True),
+    ("dimensions", "--dimensions", False),
+    ("max_seq_length", "--max_seq_length", False),
+]
+
+EMBED_TRUNCATE_SPEC: list[ArgSpec] = [
+    ("dataset", None, True),
+    ("embedding_id", None, True),
+    ("dimensions", None, True),
+]
+
+EMBED_IMPORTER_SPEC: list[ArgSpec] = [
+    ("dataset", None, True),
+    ("embedding_column", None, True),
+    ("model_id", None, True),
+    ("text_column", None, True),
+]
+
+UMAP_SPEC: list[ArgSpec] = [
+    ("dataset", None, True),
+    ("embedding_id", None, True),
+    ("neighbors", None, True),
+    ("min_dist", None, True),
+    ("init", "--init", False),
+    ("align", "--align", False),
+    ("sae_id", "--sae_id", False),
+    ("seed", "--seed", False),
+]
+
+CLUSTER_SPEC: list[ArgSpec] = [
+    ("dataset", None, True),
+    ("umap_id", None, True),
+    ("samples", None, True),
+    ("min_samples", None, True),
+    ("cluster_selection_epsilon", None, True),
+]
+
+CLUSTER_LABEL_SPEC: list[ArgSpec] = [
+    ("dataset", None, True),
+    ("text_column", None, True),
+    ("cluster_id", None, True),
+    ("chat_id", None, True),
+    ("samples", None, True),
+    ("context", None, True),
+    ("max_tokens_per_sample", "--max_tokens_per_sample", False),
+    ("max_tokens_total", "--max_tokens_total", False),
+]
+
+SCOPE_SPEC: list[ArgSpec] = [
+    ("dataset", None, True),
+    ("embedding_id", None, True),
+    ("umap_id", None, True),
+    ("cluster_id", None, True),
+    ("cluster_labels_id", None, True),
+    ("label", None, True),
+    ("description", None, True),
+    ("sae_id", "--sae_id", False),
+    ("scope_id", "--scope_id", False),
+]
+
+
+def build_argv(cmd: str, spec: Iterable[ArgSpec], args: Mapping[str, Any]) -> list[str]:
+    """Build a subprocess argv from a declarative table and request args."""
+    argv = [cmd]
+    for name, flag, always in spec:
+        value = args.get(name)
+        if not always and (value is None or value == ""):
+            continue
+        if flag:
+            argv.extend([flag, str(value)])
+        else:
+            argv.append(str(value))
+    return argv
@@ -1,11 +1,147 @@
 from __future__ import annotations
 
-import json
+import mmap
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import orjson
 
 from . import jobs_store
 
 
+# Parsed sidecar JSON per (dataset, subdir). Delete cascades consult this
+# instead of re-opening and re-parsing every .json in the directory on each
+# request. Only the foreign-key fields the delete paths query are retained —
+# those are set once when the artifact is created and never rewritten, so the
+# directory mtime alone validates the cached result; when the directory did
+# change, per-file mtimes let unchanged files skip the re-parse.
+_SIDECAR_KEYS = ("umap_id", "embedding_id", "sae_id")
+_SIDECAR_CACHE: dict[tuple[str, str], dict[str, Any]] = {}
+_SIDECAR_LOCK = threading.Lock()
+
+
+def _scan_sidecars(dataset: str, subdir: str) -> dict[str, dict]:
+    """Return {id: {foreign-key fields}} for *.json files in a dataset subdir."""
+    if not jobs_store.DATA_DIR:
+        return {}
+    directory = os.path.join(jobs_store.DATA_DIR, dataset, subdir)  # type: ignore[arg-type]
+    with _SIDECAR_LOCK:
+        try:
+            dir_mtime_ns = os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            _SIDECAR_CACHE.pop((dataset, subdir), None)
+            return {}
+        cached = _SIDECAR_CACHE.get((dataset, subdir))
+        if cached is not None and cached["dir_mtime_ns"] == dir_mtime_ns:
+            return cached["out"]
+
+        by_name = cached["by_name"] if cached is not None else {}
+        new_by_name: dict[str, tuple[int, dict | None]] = {}
+        out: dict[str, dict] = {}
+        misses: list[tuple[str, int, str]] = []
+        try:
+            entries = os.scandir(directory)
+        except FileNotFoundError:
+            _SIDECAR_CACHE.pop((dataset, subdir), None)
+            return out
+        with entries:
+            for entry in entries:
+                if not entry.name.endswith(".json") or not entry.is_file(follow_symlinks=False):
+                    continue
+                mtime_ns = entry.stat().st_mtime_ns
+                prior = by_name.get(entry.name)
+                if prior is not None and prior[0] == mtime_ns:
+                    new_by_name[entry.name] = (mtime_ns, prior[1])
+                    if prior[1] is not None:
+                        out[entry.name[: -len(".json")]] = prior[1]
+                else:
+                    misses.append((entry.name, mtime_ns, entry.path))
+
+        # Parse cold files concurrently — the open/read syscalls release the
+        # GIL, which matters when the data dir sits on slow or remote storage.
+        if len(misses) > 4:
+            with ThreadPoolExecutor(max_workers=min(32, len(misses))) as pool:
+                parsed = list(pool.map(lambda m: _load_sidecar_fields(m[2], subdir, m[0]), misses))
+        else:
+            parsed = [_load_sidecar_fields(path, subdir, name) for name, _, path in misses]
+        for (name, mtime_ns, _), fields in zip(misses, parsed):
+            new_by_name[name] = (mtime_ns, fields)
+            if fields is not None:
+                out[name[: -len(".json")]] = fields
+
+        # Inverted index: foreign key -> parent id -> child ids, so cascade
+        # lookups are dict gets instead of per-call filters over every sidecar.
+        index: dict[str, dict[str, list[str]]] = {key: {} for key in _SIDECAR_KEYS}
+        for sid, fields in out.items():
+            for key, value in fields.items():
+                index[key].setdefault(value, []).append(sid)
+
+        _SIDECAR_CACHE[(dataset, subdir)] = {
+            "dir_mtime_ns": dir_mtime_ns,
+            "by_name": new_by_name,
+            "out": out,
+            "index": index,
+        }
+        return out
+
+
+def _sidecar_children(dataset: str, subdir: str, key: str, parent_id: str) -> list[str]:
+    """Ids of sidecars in a subdir whose `key` field equals parent_id."""
+    _scan_sidecars(dataset, subdir)
+    with _SIDECAR_LOCK:
+        entry = _SIDECAR_CACHE.get((dataset, subdir))
+        if entry is None:
+            return []
+        return list(entry["index"].get(key, {}).get(parent_id, ()))
+
+
+# The foreign keys sit in the first few hundred bytes of a flat sidecar, so
+# files too large to swallow whole get a byte-regex probe instead of a full
+# JSON parse of (potentially megabytes of) fitted-model state. The probe runs
+# over an mmap of the file, so it never decodes UTF-8 or builds a Python
+# string for the document, and only the pages it actually touches are read —
+# usually just the first — while still finding keys past any fixed head size.
+_SIDECAR_HEAD_BYTES = 4096
+_SIDECAR_KEY_PATTERNS = {
+    key: re.compile(rb'"' + key.encode() + rb'"\s*:\s*"([^"\\]*)"') for key in _SIDECAR_KEYS
+}
+
+
+def _load_sidecar_fields(path: str, subdir: str, name: str) -> dict | None:
+    try:
+        with open(path, "rb") as f:
+            head = f.read(_SIDECAR_HEAD_BYTES)
+            if len(head) == _SIDECAR_HEAD_BYTES:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return {
+                        key: match.group(1).decode()
+                        for key, pattern in _SIDECAR_KEY_PATTERNS.items()
+                        if (match := pattern.search(mm))
+                    }
+            data = orjson.loads(head)
+    except Exception:
+        # Preserve legacy behavior: swallow malformed sidecar JSON.
+        print("ERROR LOADING", subdir.upper(), name)
+        return None
+    if not isinstance(data, dict):
+        return None
+    return {k: data[k] for k in _SIDECAR_KEYS if k in data}
+
+
+def _artifact_glob(dataset: str, subdir: str, artifact_id: str) -> str:
+    """Glob covering all of an artifact's files under the data dir.
+
+    A plain f-string rather than os.path.join: the cascade builders call this
+    once per artifact id and join's pure-Python overhead adds up at thousands
+    of ids. DATA_DIR is read per call so test shims that reload jobs_store
+    with a different data dir stay correct.
+    """
+    return f"{jobs_store.DATA_DIR}/{dataset}/{subdir}/{artifact_id}*"
+
+
 def _escape_rm_glob(p: str) -> str:
     # Preserve legacy behavior: escape spaces but do not shell-quote.
     return p.replace(" ", "\\ ")
@@ -16,103 +152,91 @@ def build_rm_rf_command(path_glob: str) -> str:
 
 
 def find_clusters_to_delete_for_umap(dataset: str, umap_id: str) -> list[str]:
-    if not jobs_store.DATA_DIR:
-        return []
-    cluster_dir = os.path.join(jobs_store.DATA_DIR, dataset, "clusters")  # type: ignore[arg-type]
-    clusters_to_delete: list[str] = []
-    for file in os.listdir(cluster_dir):
-        if not file.endswith(".json"):
-            continue
-        try:
-            with open(os.path.join(cluster_dir, file), "r") as f:
-                cluster_data = json.load(f)
-            if cluster_data.get("umap_id") == umap_id:
-                clusters_to_delete.append(file.replace(".json", ""))
-        except Exception:
-            # Preserve legacy behavior: swallow malformed cluster JSON.
-            print("ERROR LOADING CLUSTER", file)
-    return clusters_to_delete
+    return _sidecar_children(dataset, "clusters", "umap_id", umap_id)
 
 
 def build_delete_umap_command(dataset: str, umap_id: str) -> str:
     if not jobs_store.DATA_DIR:
         return build_rm_rf_command("")
-    path = os.path.join(jobs_store.DATA_DIR, dataset, "umaps", f"{umap_id}*")  # type: ignore[arg-type]
-    command = build_rm_rf_command(path)
-    for cluster in find_clusters_to_delete_for_umap(dataset, umap_id):
-        cpath = os.path.join(jobs_store.DATA_DIR, dataset, "clusters", f"{cluster}*")  # type: ignore[arg-type]
-        command += f"; {build_rm_rf_command(cpath)}"
-    return command
+    parts = [build_rm_rf_command(_artifact_glob(dataset, "umaps", umap_id))]
+    parts.extend(
+        build_rm_rf_command(_artifact_glob(dataset, "clusters", cluster))
+        for cluster in find_clusters_to_delete_for_umap(dataset, umap_id)
+    )
+    return "; ".join(parts)
 
 
 def build_delete_umap_globs(dataset: str, umap_id: str) -> list[str]:
     if not jobs_store.DATA_DIR:
         return []
-    patterns = [os.path.join(jobs_store.DATA_DIR, dataset, "umaps", f"{umap_id}*")]  # type: ignore[arg-type]
+    patterns = [_artifact_glob(dataset, "umaps", umap_id)]
     for cluster in find_clusters_to_delete_for_umap(dataset, umap_id):
-        patterns.append(
-            os.path.join(jobs_store.DATA_DIR, dataset, "clusters", f"{cluster}*")  # type: ignore[arg-type]
-        )
+        patterns.append(_artifact_glob(dataset, "clusters", cluster))
     return patterns
 
 
 def find_umaps_to_delete_for_embedding(dataset: str, embedding_id: str) -> list[str]:
-    if not jobs_store.DATA_DIR:
-        return []
-    umap_dir = os.path.join(jobs_store.DATA_DIR, dataset, "umaps")  # type: ignore[arg-type]
-    if not os.path.exists(umap_dir):
-        return []
-    umaps_to_delete: list[str] = []
-    for file in os.listdir(umap_dir):
-        if not file.endswith(".json"):
-            continue
-        try:
-            with open(os.path.join(umap_dir, file), "r") as f:
-                umap_data = json.load(f)
-            if umap_data.get("embedding_id") == embedding_id:
-                umaps_to_delete.append(file.replace(".json", ""))
-        except Exception:
-            # Preserve legacy behavior: swallow malformed UMAP JSON.
-            print("ERROR LOADING UMAP", file)
-    return umaps_to_delete
+    return _sidecar_children(dataset, "umaps", "embedding_id", embedding_id)
 
 
 def build_delete_embedding_command(dataset: str, embedding_id: str) -> str:
     if not jobs_store.DATA_DIR:
         return build_rm_rf_command("")
-    path = os.path.join(jobs_store.DATA_DIR, dataset, "embeddings", f"{embedding_id}*")  # type: ignore[arg-type]
-    command = build_rm_rf_command(path)
-    for sae_id in find_saes_to_delete_for_embedding(dataset, embedding_id):
-        spath = os.path.join(jobs_store.DATA_DIR, dataset, "saes", f"{sae_id}*")  # type: ignore[arg-type]
-        command += f"; {build_rm_rf_command(spath)}"
-    return command
+    parts = [build_rm_rf_command(_artifact_glob(dataset, "embeddings", embedding_id))]
+    parts.extend(
+        build_rm_rf_command(_artifact_glob(dataset, "saes", sae_id))
+        for sae_id in find_saes_to_delete_for_embedding(dataset, embedding_id)
+    )
+    return "; ".join(parts)
 
 def build_delete_embedding_globs(dataset: str, embedding_id: str) -> list[str]:
     if not jobs_store.DATA_DIR:
         return []
-    patterns: list[str] = [
-        os.path.join(jobs_store.DATA_DIR, dataset, "embeddings", f"{embedding_id}*")  # type: ignore[arg-type]
-    ]
+    patterns: list[str] = [_artifact_glob(dataset, "embeddings", embedding_id)]
     for sae_id in find_saes_to_delete_for_embedding(dataset, embedding_id):
-        patterns.append(
-            os.path.join(jobs_store.DATA_DIR, dataset, "saes", f"{sae_id}*")  # type: ignore[arg-type]
-        )
+        patterns.append(_artifact_glob(dataset, "saes", sae_id))
     return patterns
 
 
 def find_saes_to_delete_for_embedding(dataset: str, embedding_id: str) -> list[str]:
+    return _sidecar_children(dataset, "saes", "embedding_id", embedding_id)
+
+
+def build_cascade_delete_embedding_globs(dataset: str, embedding_id: str) -> list[str]:
+    """The full deletion closure for an embedding in one pass per directory.
+
+    Collects the embedding itself, its saes, every umap hanging off the
+    embedding or one of those saes, and every cluster of those umaps —
+    instead of re-scanning clusters/ once per umap and issuing a delete job
+    per umap.
+    """
     if not jobs_store.DATA_DIR:
         return []
-    sae_dir = os.path.join(jobs_store.DATA_DIR, dataset, "saes")  # type: ignore[arg-type]
-    if not os.path.exists(sae_dir):
-        return []
+    sae_ids = find_saes_to_delete_for_embedding(dataset, embedding_id)
+    umap_ids = list(
+        dict.fromkeys(
+            find_umaps_to_delete_for_embedding(dataset, embedding_id)
+            + [
+                umap_id
+                for sae_id in sae_ids
+                for umap_id in _sidecar_children(dataset, "umaps", "sae_id", sae_id)
+            ]
+        )
+    )
+    cluster_ids = [
+        cluster_id
+        for umap_id in umap_ids
+        for cluster_id in find_clusters_to_delete_for_umap(dataset, umap_id)
+    ]
+
+    patterns = [_artifact_glob(dataset, "embeddings", embedding_id)]
+    patterns.extend(_artifact_glob(dataset, "saes", sae_id) for sae_id in sae_ids)
+    patterns.extend(_artifact_glob(dataset, "umaps", umap_id) for umap_id in umap_ids)
+    patterns.extend(_artifact_glob(dataset, "clusters", cluster_id) for cluster_id in cluster_ids)
+    return patterns
+
 
-    saes_to_delete: list[str] = []
-    for file in os.listdir(sae_dir):
-        if not file.endswith(".json"):
-            continue
-        with open(os.path.join(sae_dir, file), "r") as f:
-            sae_data = json.load(f)
-        if sae_data.get("embedding_id") == embedding_id:
-            saes_to_delete.append(file.replace(".json", ""))
-    return saes_to_delete
+def join_rm_rf_commands(globs_list: list[str]) -> str:
+    """Display command for a glob list, so callers who already computed the
+    globs don't trigger a second cascade walk."""
+    return "; ".join(build_rm_rf_command(pattern) for pattern in globs_list)
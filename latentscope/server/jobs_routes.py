@@ -1,37 +1,77 @@
 from __future__ import annotations
 
+import functools
 import json
 import os
 import shlex
 import shutil
 import sys
-import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 
-from flask import Blueprint, jsonify, request
+import orjson
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 
 from latentscope.importers.twitter import sanitize_dataset_id, validate_extracted_archive_payload
 
 from . import jobs_store
-from .jobs_commands import falsy_flag, shell_join, truthy_flag
+from .jobs_commands import (
+    CLUSTER_LABEL_SPEC,
+    CLUSTER_SPEC,
+    EMBED_IMPORTER_SPEC,
+    EMBED_SPEC,
+    EMBED_TRUNCATE_SPEC,
+    SCOPE_SPEC,
+    UMAP_SPEC,
+    build_argv,
+    falsy_flag,
+    shell_join,
+    truthy_flag,
+)
 from .jobs_delete import (
-    build_delete_embedding_command,
-    build_delete_embedding_globs,
+    build_cascade_delete_embedding_globs,
     build_delete_umap_globs,
-    build_delete_umap_command,
-    find_umaps_to_delete_for_embedding,
+    join_rm_rf_commands,
 )
-from .jobs_runner import PROCESSES, kill_process, run_job
+from .jobs_runner import LIVE_JOBS, PROCESSES, _env_int, kill_process, run_job
 
 
 jobs_bp = Blueprint("jobs_bp", __name__)
 jobs_write_bp = Blueprint("jobs_write_bp", __name__)
 
+# Bounded worker pool instead of one unbounded thread per request: a burst of
+# submissions (or client retries) queues up instead of spawning arbitrarily
+# many threads each holding a pipe and env copy. Kills stay in the request
+# thread (kill_process is a dict lookup + signal), so they can't be starved
+# by queued jobs.
+_JOB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=_env_int("LATENT_SCOPE_MAX_CONCURRENT_JOBS", 8),
+    thread_name_prefix="ls-job",
+)
+
 
 def _start_job_thread(
     *, dataset: str, job_id: str, job_spec: dict, cleanup_paths: list[str] | None = None
 ) -> None:
-    threading.Thread(target=run_job, args=(dataset, job_id, job_spec, cleanup_paths)).start()
+    # Persist a queued stub before submitting: when the executor is saturated
+    # the job waits in its queue, and pollers should see "queued" rather than
+    # a 404. run_job overwrites this with the running record on pickup.
+    jobs_store.write_job(
+        dataset,
+        job_id,
+        {
+            "id": job_id,
+            "dataset": dataset,
+            "command": job_spec.get("display_command", ""),
+            "status": "queued",
+            "last_update": str(datetime.now()),
+            "progress": [],
+            "times": [],
+        },
+    )
+    _JOB_EXECUTOR.submit(run_job, dataset, job_id, job_spec, cleanup_paths)
 
 
 def _start_subprocess_job(
@@ -50,25 +90,170 @@ def _start_subprocess_job(
     )
 
 
+@functools.lru_cache(maxsize=512)
+def _cached_shlex_split(command: str) -> tuple[str, ...]:
+    # The same failed legacy command tends to be rerun repeatedly; shlex is a
+    # pure-Python state machine, so cache its output per command string.
+    return tuple(shlex.split(command))
+
+
+def _save_upload(file, file_path: str) -> None:
+    """Save an uploaded file, using zero-copy sendfile when the upload already
+    spilled to a real temp file; small in-memory uploads take Werkzeug's save.
+    """
+    stream = file.stream
+    # SpooledTemporaryFile only exposes a real fd once rolled over to disk;
+    # asking for fileno() earlier would force the rollover we're avoiding.
+    if (
+        sys.platform.startswith("linux")
+        and hasattr(os, "sendfile")
+        and getattr(stream, "_rolled", False)
+    ):
+        try:
+            src_fd = stream.fileno()
+            size = os.fstat(src_fd).st_size
+            with open(file_path, "wb") as dst:
+                dst_fd = dst.fileno()
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            return
+        except OSError:
+            pass
+    file.save(file_path)
+
+
+# Deletes get their own tiny pool so a scope spanning gigabytes of artifacts
+# can't block the request thread, and queued pipeline jobs can't starve a
+# cleanup. Two workers: deletes are disk-bound and rarely overlap.
+_CLEANUP_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ls-cleanup")
+
+
 def _start_delete_job(*, dataset: str, job_id: str, globs: list[str], display_command: str) -> None:
-    _start_job_thread(
-        dataset=dataset,
-        job_id=job_id,
-        job_spec={"kind": "delete", "globs": globs, "display_command": display_command},
+    # Persist a queued stub first so polling the returned job_id never 404s.
+    jobs_store.write_job(
+        dataset,
+        job_id,
+        {
+            "id": job_id,
+            "dataset": dataset,
+            "command": display_command,
+            "status": "queued",
+            "last_update": str(datetime.now()),
+            "progress": [],
+            "times": [],
+        },
+    )
+    _CLEANUP_EXECUTOR.submit(
+        run_job,
+        dataset,
+        job_id,
+        {"kind": "delete", "globs": globs, "display_command": display_command},
     )
 
 
+def _next_poll_ms(job: dict) -> int:
+    """Suggested client poll interval: tight while lines are flowing, backing
+    off toward 10s for a job sitting silent inside a long fit. 0 once the job
+    is terminal so the client stops polling."""
+    if job.get("status") not in ("running", "queued"):
+        return 0
+    try:
+        last_update = datetime.fromisoformat(str(job.get("last_update"))).timestamp()
+    except ValueError:
+        return 500
+    idle = max(0.0, time.time() - last_update)
+    return min(10000, max(500, int(idle * 500)))
+
+
 @jobs_bp.route("/job")
 def get_job():
     dataset = request.args.get("dataset")
     job_id = request.args.get("job_id")
     if not dataset or not job_id:
         return jsonify({"error": "Missing dataset or job_id"}), 400
-    try:
-        job = jobs_store.read_job(dataset, job_id)
-    except FileNotFoundError:
-        return jsonify({"status": "not found"}), 404
-    return jsonify(job)
+
+    # Unchanged files short-circuit before any read or parse.
+    etag = jobs_store.job_etag(dataset, job_id)
+    if etag is not None and request.headers.get("If-None-Match") == etag:
+        return "", 304, {"ETag": etag, "Cache-Control": "no-cache"}
+
+    since = request.args.get("since")
+    if since is not None:
+        # Tail poll: the client tracks the sidecar byte offset it has seen and
+        # gets back only new JSONL records plus the small meta.
+        try:
+            offset = int(since)
+        except ValueError:
+            return jsonify({"error": "Invalid since offset"}), 400
+        try:
+            meta = jobs_store.read_job_meta(dataset, job_id)
+        except FileNotFoundError:
+            return jsonify({"status": "not found"}), 404
+        new_lines, new_offset = jobs_store.read_progress_tail(dataset, job_id, offset)
+        next_poll_ms = _next_poll_ms(meta)
+        response = jsonify(
+            {"meta": meta, "new_lines": new_lines, "offset": new_offset, "next_poll_ms": next_poll_ms}
+        )
+    else:
+        try:
+            job = jobs_store.read_job(dataset, job_id)
+        except FileNotFoundError:
+            return jsonify({"status": "not found"}), 404
+        next_poll_ms = _next_poll_ms(job)
+        job["next_poll_ms"] = next_poll_ms
+        response = jsonify(job)
+
+    response.headers["Retry-After"] = str(round(next_poll_ms / 1000))
+    if etag is not None:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@jobs_bp.route("/job/stream")
+def stream_job():
+    """Server-Sent Events view of a job's progress.
+
+    Tails the sidecar JSONL on disk rather than wiring subscriber queues into
+    the runner, so it works for any job regardless of which worker (or
+    process) is running it. Each new progress record becomes one `data:`
+    event; a final `meta` event carries the terminal job doc, and idle waits
+    emit comment keepalives so proxies don't drop the connection.
+    """
+    dataset = request.args.get("dataset")
+    job_id = request.args.get("job_id")
+    if not dataset or not job_id:
+        return jsonify({"error": "Missing dataset or job_id"}), 400
+
+    def generate():
+        offset = 0
+        idle = 0.0
+        while True:
+            try:
+                meta = jobs_store.read_job_meta(dataset, job_id)
+            except FileNotFoundError:
+                yield b'event: error\ndata: {"status": "not found"}\n\n'
+                return
+            new_lines, offset = jobs_store.read_progress_tail(dataset, job_id, offset)
+            for line in new_lines:
+                yield b"data: " + line.encode() + b"\n\n"
+            if meta.get("status") not in ("running", "queued"):
+                yield b"event: meta\ndata: " + orjson.dumps(meta) + b"\n\n"
+                return
+            if new_lines:
+                idle = 0.0
+            else:
+                idle += 0.25
+                if idle >= 15.0:
+                    yield b": keepalive\n\n"
+                    idle = 0.0
+            time.sleep(0.25)
+
+    return Response(stream_with_context(generate()), mimetype="text/event-stream")
 
 
 @jobs_bp.route("/all")
@@ -76,25 +261,57 @@ def get_jobs():
     dataset = request.args.get("dataset")
     if not dataset:
         return jsonify([]), 200
-    return jsonify(jobs_store.list_jobs(dataset))
+    jobs = jobs_store.list_jobs(dataset)
+
+    # Stream the array one job at a time instead of serializing the whole
+    # list into a single buffer; long job histories start flowing to the
+    # client immediately.
+    def generate():
+        yield b"["
+        first = True
+        for job in jobs:
+            if not first:
+                yield b","
+            first = False
+            yield orjson.dumps(job)
+        yield b"]"
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
 
 
 @jobs_write_bp.route("/ingest", methods=["POST"])
 def run_ingest():
-    dataset = request.form.get("dataset")
-    file = request.files.get("file")
-    text_column = request.form.get("text_column")
-    if not dataset or file is None:
-        return jsonify({"error": "Missing dataset or file"}), 400
+    multipart = (request.content_type or "").startswith("multipart/")
+    if multipart:
+        dataset = request.form.get("dataset")
+        file = request.files.get("file")
+        text_column = request.form.get("text_column")
+        if not dataset or file is None:
+            return jsonify({"error": "Missing dataset or file"}), 400
+        filename = file.filename
+    else:
+        # Raw-body variant: metadata comes from query args and the body is
+        # streamed straight to the destination in fixed-size chunks, skipping
+        # the multipart parser's spool-then-copy double write entirely.
+        dataset = request.args.get("dataset")
+        filename = request.args.get("filename")
+        text_column = request.args.get("text_column")
+        if not dataset or not filename:
+            return jsonify({"error": "Missing dataset or filename"}), 400
+        filename = os.path.basename(filename)
     if not jobs_store.DATA_DIR:
         return jsonify({"error": "LATENT_SCOPE_DATA must be set"}), 500
 
     dataset_dir = os.path.join(jobs_store.DATA_DIR, dataset)  # type: ignore[arg-type]
     os.makedirs(dataset_dir, exist_ok=True)
-    file_path = os.path.join(dataset_dir, file.filename)
-    file.save(file_path)
+    file_path = os.path.join(dataset_dir, filename)
+    if multipart:
+        _save_upload(file, file_path)
+    else:
+        with open(file_path, "wb") as out:
+            shutil.copyfileobj(request.stream, out, length=1 << 20)
 
-    job_id = str(uuid.uuid4())
+    job_id = uuid.uuid4().hex
     argv = ["ls-ingest", dataset, "--path", file_path]
     if text_column:
         argv.extend(["--text_column", text_column])
@@ -102,9 +319,28 @@ def run_ingest():
     return jsonify({"job_id": job_id, "dataset": dataset})
 
 
+# Optional form fields forwarded verbatim as --<key> <value> pairs.
+_IMPORT_TWITTER_OPTIONAL_KEYS = (
+    "year",
+    "lang",
+    "min_favorites",
+    "min_text_length",
+    "top_n",
+    "sort",
+    "text_column",
+    "embedding_model",
+    "umap_neighbors",
+    "umap_min_dist",
+    "cluster_samples",
+    "cluster_min_samples",
+    "cluster_selection_epsilon",
+    "import_batch_id",
+)
+
+
 @jobs_write_bp.route("/import_twitter", methods=["POST"])
 def run_import_twitter():
-    job_id = str(uuid.uuid4())
+    job_id = uuid.uuid4().hex
     dataset = request.form.get("dataset", "")
     source_type = request.form.get("source_type", "community_json").strip().lower()
     cleanup_paths: list[str] = []
@@ -146,40 +382,30 @@ def run_import_twitter():
         file = request.files.get("file")
         if file is None:
             return jsonify({"error": "Missing community JSON file"}), 400
-        job_upload_dir = os.path.join(uploads_dir, job_id)
-        os.makedirs(job_upload_dir, exist_ok=True)
-        file_path = os.path.join(job_upload_dir, f"community-extract-{uuid.uuid4().hex}.json")
-        file.save(file_path)
+        # Validate straight off the upload stream: one binary read, one orjson
+        # parse, and the file only lands on disk once it passed — no
+        # save-then-reload round trip or cleanup of rejected uploads.
+        raw = file.stream.read()
         try:
-            with open(file_path, "r", encoding="utf-8") as handle:
-                payload = json.load(handle)
+            payload = orjson.loads(raw)
             validate_extracted_archive_payload(payload, require_archive_format=True)
-        except (OSError, json.JSONDecodeError, ValueError) as err:
-            shutil.rmtree(job_upload_dir, ignore_errors=True)
+        except ValueError as err:
             return jsonify({"error": f"Invalid extracted archive payload: {err}"}), 400
+        del payload
+        job_upload_dir = os.path.join(uploads_dir, job_id)
+        os.makedirs(job_upload_dir, exist_ok=True)
+        file_path = os.path.join(job_upload_dir, f"community-extract-{uuid.uuid4().hex}.json")
+        with open(file_path, "wb") as handle:
+            handle.write(raw)
+        del raw
         cleanup_paths.append(job_upload_dir)
         command_parts.extend(["--source", "community_json", "--input_path", file_path])
     else:
         return jsonify({"error": f"Unsupported source_type: {source_type}"}), 400
 
-    optional_args = [
-        ("year", request.form.get("year")),
-        ("lang", request.form.get("lang")),
-        ("min_favorites", request.form.get("min_favorites")),
-        ("min_text_length", request.form.get("min_text_length")),
-        ("top_n", request.form.get("top_n")),
-        ("sort", request.form.get("sort")),
-        ("text_column", request.form.get("text_column")),
-        ("embedding_model", request.form.get("embedding_model")),
-        ("umap_neighbors", request.form.get("umap_neighbors")),
-        ("umap_min_dist", request.form.get("umap_min_dist")),
-        ("cluster_samples", request.form.get("cluster_samples")),
-        ("cluster_min_samples", request.form.get("cluster_min_samples")),
-        ("cluster_selection_epsilon", request.form.get("cluster_selection_epsilon")),
-        ("import_batch_id", request.form.get("import_batch_id")),
-    ]
-
-    for key, value in optional_args:
+    form = request.form
+    for key in _IMPORT_TWITTER_OPTIONAL_KEYS:
+        value = form.get(key)
         if value is not None and value != "":
             command_parts.extend([f"--{key}", str(value)])
 
@@ -213,7 +439,7 @@ def run_reingest():
     dataset_dir = os.path.join(jobs_store.DATA_DIR, dataset)  # type: ignore[arg-type]
     file_path = os.path.join(dataset_dir, "input.parquet")
 
-    job_id = str(uuid.uuid4())
+    job_id = uuid.uuid4().hex
     argv = ["ls-ingest", dataset, "--path", file_path]
     if text_column:
         argv.extend(["--text_column", text_column])
@@ -223,55 +449,25 @@ def run_reingest():
 
 @jobs_write_bp.route("/embed")
 def run_embed():
-    dataset = request.args.get("dataset")
-    text_column = request.args.get("text_column")
-    model_id = request.args.get("model_id")
-    prefix = request.args.get("prefix")
-    dimensions = request.args.get("dimensions")
-    batch_size = request.args.get("batch_size")
-    max_seq_length = request.args.get("max_seq_length")
-
-    job_id = str(uuid.uuid4())
-    argv = [
-        "ls-embed",
-        str(dataset),
-        str(text_column),
-        str(model_id),
-        "--prefix",
-        str(prefix),
-        "--batch_size",
-        str(batch_size),
-    ]
-    if dimensions is not None:
-        argv.extend(["--dimensions", str(dimensions)])
-    if max_seq_length is not None:
-        argv.extend(["--max_seq_length", str(max_seq_length)])
-    _start_subprocess_job(dataset=dataset, job_id=job_id, argv=argv)
+    job_id = uuid.uuid4().hex
+    argv = build_argv("ls-embed", EMBED_SPEC, request.args)
+    _start_subprocess_job(dataset=request.args.get("dataset"), job_id=job_id, argv=argv)
     return jsonify({"job_id": job_id})
 
 
 @jobs_write_bp.route("/embed_truncate")
 def run_embed_truncate():
-    dataset = request.args.get("dataset")
-    embedding_id = request.args.get("embedding_id")
-    dimensions = request.args.get("dimensions")
-
-    job_id = str(uuid.uuid4())
-    argv = ["ls-embed-truncate", str(dataset), str(embedding_id), str(dimensions)]
-    _start_subprocess_job(dataset=dataset, job_id=job_id, argv=argv)
+    job_id = uuid.uuid4().hex
+    argv = build_argv("ls-embed-truncate", EMBED_TRUNCATE_SPEC, request.args)
+    _start_subprocess_job(dataset=request.args.get("dataset"), job_id=job_id, argv=argv)
     return jsonify({"job_id": job_id})
 
 
 @jobs_write_bp.route("/embed_importer")
 def run_embed_importer():
-    dataset = request.args.get("dataset")
-    model_id = request.args.get("model_id")
-    embedding_column = request.args.get("embedding_column")
-    text_column = request.args.get("text_column")
-
-    job_id = str(uuid.uuid4())
-    argv = ["ls-embed-importer", str(dataset), str(embedding_column), str(model_id), str(text_column)]
-    _start_subprocess_job(dataset=dataset, job_id=job_id, argv=argv)
+    job_id = uuid.uuid4().hex
+    argv = build_argv("ls-embed-importer", EMBED_IMPORTER_SPEC, request.args)
+    _start_subprocess_job(dataset=request.args.get("dataset"), job_id=job_id, argv=argv)
     return jsonify({"job_id": job_id})
 
 
@@ -292,7 +488,7 @@ def rerun_job():
     else:
         command = str(job.get("command") or "")
         try:
-            legacy_argv = shlex.split(command)
+            legacy_argv = _cached_shlex_split(command)
         except ValueError as err:
             return jsonify({"error": f"Unable to rerun legacy job command safely: {err}"}), 400
         legacy_argv = [*legacy_argv, "--rerun", str(run_id)]
@@ -301,7 +497,7 @@ def rerun_job():
             "argv": legacy_argv,
             "display_command": shell_join(legacy_argv),
         }
-    new_job_id = str(uuid.uuid4())
+    new_job_id = uuid.uuid4().hex
     print("new job id", new_job_id)
     _start_job_thread(dataset=dataset, job_id=new_job_id, job_spec=job_spec)
     return jsonify({"job_id": new_job_id})
@@ -313,14 +509,27 @@ def kill_job():
     job_id = request.args.get("job_id")
     if not dataset or not job_id:
         return jsonify({"error": "Missing dataset or job_id"}), 400
+    killed = kill_process(job_id)
+    cause = "killed" if killed else "process not found, presumed dead"
+    live = LIVE_JOBS.get(job_id)
+    if live is not None:
+        # Update the runner's in-memory job; its final flush persists the
+        # dead status, so no disk read/parse/rewrite here.
+        live["status"] = "dead"
+        live["cause_of_death"] = cause
+        return jsonify(
+            {
+                **live,
+                "progress": list(live["progress"]),
+                "times": [
+                    str(datetime.fromtimestamp(t)) if isinstance(t, float) else t
+                    for t in live["times"]
+                ],
+            }
+        )
     job = jobs_store.read_job(dataset, job_id)
-    if kill_process(job_id):
-        job["status"] = "dead"
-        job["cause_of_death"] = "killed"
-        jobs_store.write_job(dataset, job_id, job)
-        return jsonify(job)
     job["status"] = "dead"
-    job["cause_of_death"] = "process not found, presumed dead"
+    job["cause_of_death"] = cause
     jobs_store.write_job(dataset, job_id, job)
     return jsonify(job)
 
@@ -330,43 +539,22 @@ def delete_embedding():
     dataset = request.args.get("dataset")
     embedding_id = request.args.get("embedding_id")
 
-    umaps_to_delete = find_umaps_to_delete_for_embedding(dataset, embedding_id)
-
-    job_id = str(uuid.uuid4())
-    globs = build_delete_embedding_globs(dataset, embedding_id)
-    display_command = build_delete_embedding_command(dataset, embedding_id)
-    for umap in umaps_to_delete:
-        _ = delete_umap(dataset, umap)
+    # One job covering the whole closure (embedding, saes, umaps, clusters)
+    # instead of a separate delete job per dependent umap.
+    job_id = uuid.uuid4().hex
+    globs = build_cascade_delete_embedding_globs(dataset, embedding_id)
+    display_command = join_rm_rf_commands(globs)
     _start_delete_job(dataset=dataset, job_id=job_id, globs=globs, display_command=display_command)
     return jsonify({"job_id": job_id})
 
 
 @jobs_write_bp.route("/umap")
 def run_umap():
-    dataset = request.args.get("dataset")
-    embedding_id = request.args.get("embedding_id")
-    sae_id = request.args.get("sae_id")
-    neighbors = request.args.get("neighbors")
-    min_dist = request.args.get("min_dist")
-    init = request.args.get("init")
-    align = request.args.get("align")
-    save = request.args.get("save")
-    seed = request.args.get("seed")
-
-    job_id = str(uuid.uuid4())
-    argv = ["ls-umap", str(dataset), str(embedding_id), str(neighbors), str(min_dist)]
-    if init:
-        argv.extend(["--init", str(init)])
-    if align:
-        argv.extend(["--align", str(align)])
-    if save:
+    job_id = uuid.uuid4().hex
+    argv = build_argv("ls-umap", UMAP_SPEC, request.args)
+    if request.args.get("save"):
         argv.append("--save")
-    if sae_id:
-        argv.extend(["--sae_id", str(sae_id)])
-    if seed:
-        argv.extend(["--seed", str(seed)])
-
-    _start_subprocess_job(dataset=dataset, job_id=job_id, argv=argv)
+    _start_subprocess_job(dataset=request.args.get("dataset"), job_id=job_id, argv=argv)
     return jsonify({"job_id": job_id})
 
 
@@ -378,24 +566,18 @@ def delete_umap_request():
 
 
 def delete_umap(dataset: str, umap_id: str):
-    job_id = str(uuid.uuid4())
+    job_id = uuid.uuid4().hex
     globs = build_delete_umap_globs(dataset, umap_id)
-    display_command = build_delete_umap_command(dataset, umap_id)
+    display_command = join_rm_rf_commands(globs)
     _start_delete_job(dataset=dataset, job_id=job_id, globs=globs, display_command=display_command)
     return jsonify({"job_id": job_id})
 
 
 @jobs_write_bp.route("/cluster")
 def run_cluster():
-    dataset = request.args.get("dataset")
-    umap_id = request.args.get("umap_id")
-    samples = request.args.get("samples")
-    min_samples = request.args.get("min_samples")
-    cluster_selection_epsilon = request.args.get("cluster_selection_epsilon")
-
-    job_id = str(uuid.uuid4())
-    argv = ["ls-cluster", str(dataset), str(umap_id), str(samples), str(min_samples), str(cluster_selection_epsilon)]
-    _start_subprocess_job(dataset=dataset, job_id=job_id, argv=argv)
+    job_id = uuid.uuid4().hex
+    argv = build_argv("ls-cluster", CLUSTER_SPEC, request.args)
+    _start_subprocess_job(dataset=request.args.get("dataset"), job_id=job_id, argv=argv)
     return jsonify({"job_id": job_id})
 
 
@@ -403,7 +585,7 @@ def run_cluster():
 def delete_cluster():
     dataset = request.args.get("dataset")
     cluster_id = request.args.get("cluster_id")
-    job_id = str(uuid.uuid4())
+    job_id = uuid.uuid4().hex
     path_glob = os.path.join(jobs_store.DATA_DIR or "", dataset, "clusters", f"{cluster_id}*")
     display_command = f"rm -rf {path_glob}".strip()
     _start_delete_job(dataset=dataset, job_id=job_id, globs=[path_glob], display_command=display_command)
@@ -412,21 +594,11 @@ def delete_cluster():
 
 @jobs_write_bp.route("/cluster_label")
 def run_cluster_label():
-    dataset = request.args.get("dataset")
-    chat_id = request.args.get("chat_id")
-    text_column = request.args.get("text_column")
-    cluster_id = request.args.get("cluster_id")
-    context = request.args.get("context")
-    samples = request.args.get("samples")
-    max_tokens_per_sample = request.args.get("max_tokens_per_sample")
-    max_tokens_total = request.args.get("max_tokens_total")
-    job_id = str(uuid.uuid4())
-    argv = ["ls-label", str(dataset), str(text_column), str(cluster_id), str(chat_id), str(samples), str(context or "")]
-    if max_tokens_per_sample:
-        argv.extend(["--max_tokens_per_sample", str(max_tokens_per_sample)])
-    if max_tokens_total:
-        argv.extend(["--max_tokens_total", str(max_tokens_total)])
-    _start_subprocess_job(dataset=dataset, job_id=job_id, argv=argv)
+    job_id = uuid.uuid4().hex
+    params = request.args.to_dict()
+    params["context"] = request.args.get("context") or ""
+    argv = build_argv("ls-label", CLUSTER_LABEL_SPEC, params)
+    _start_subprocess_job(dataset=request.args.get("dataset"), job_id=job_id, argv=argv)
     return jsonify({"job_id": job_id})
 
 
@@ -434,7 +606,7 @@ def run_cluster_label():
 def delete_cluster_label():
     dataset = request.args.get("dataset")
     cluster_labels_id = request.args.get("cluster_labels_id")
-    job_id = str(uuid.uuid4())
+    job_id = uuid.uuid4().hex
     path_glob = os.path.join(jobs_store.DATA_DIR or "", dataset, "clusters", f"{cluster_labels_id}*")
     display_command = f"rm -rf {path_glob}".strip()
     _start_delete_job(dataset=dataset, job_id=job_id, globs=[path_glob], display_command=display_command)
@@ -443,32 +615,9 @@ def delete_cluster_label():
 
 @jobs_write_bp.route("/scope")
 def run_scope():
-    dataset = request.args.get("dataset")
-    embedding_id = request.args.get("embedding_id")
-    sae_id = request.args.get("sae_id")
-    umap_id = request.args.get("umap_id")
-    cluster_id = request.args.get("cluster_id")
-    cluster_labels_id = request.args.get("cluster_labels_id")
-    label = request.args.get("label")
-    description = request.args.get("description")
-    scope_id = request.args.get("scope_id")
-
-    job_id = str(uuid.uuid4())
-    argv = [
-        "ls-scope",
-        str(dataset),
-        str(embedding_id),
-        str(umap_id),
-        str(cluster_id),
-        str(cluster_labels_id),
-        str(label),
-        str(description),
-    ]
-    if sae_id:
-        argv.extend(["--sae_id", str(sae_id)])
-    if scope_id:
-        argv.extend(["--scope_id", str(scope_id)])
-    _start_subprocess_job(dataset=dataset, job_id=job_id, argv=argv)
+    job_id = uuid.uuid4().hex
+    argv = build_argv("ls-scope", SCOPE_SPEC, request.args)
+    _start_subprocess_job(dataset=request.args.get("dataset"), job_id=job_id, argv=argv)
     return jsonify({"job_id": job_id})
 
 
@@ -477,7 +626,7 @@ def delete_scope():
     dataset = request.args.get("dataset")
     scope_id = request.args.get("scope_id")
 
-    job_id = str(uuid.uuid4())
+    job_id = uuid.uuid4().hex
     path_glob = os.path.join(jobs_store.DATA_DIR or "", dataset, "scopes", f"{scope_id}*")
     display_command = f"rm -rf {path_glob}".strip()
     _start_delete_job(dataset=dataset, job_id=job_id, globs=[path_glob], display_command=display_command)
@@ -490,10 +639,11 @@ def run_plot():
     scope_id = request.args.get("scope_id")
     config = request.args.get("config")
 
-    job_id = str(uuid.uuid4())
+    job_id = uuid.uuid4().hex
     # Preserve legacy behavior: `config` is a string query param; old code used `json.dumps(config)`
     # which double-serialized JSON strings and produced `null` when config was omitted.
-    escaped_config = json.dumps(config)
+    # Skip the encoder entirely for the common omitted-config case.
+    escaped_config = "null" if config is None else json.dumps(config)
     argv = [
         "ls-export-plot",
         str(dataset),
@@ -509,7 +659,7 @@ def download_dataset():
     dataset_repo = request.args.get("dataset_repo")
     dataset_name = request.args.get("dataset_name")
 
-    job_id = str(uuid.uuid4())
+    job_id = uuid.uuid4().hex
     argv = ["ls-download-dataset", str(dataset_repo), str(dataset_name), str(jobs_store.DATA_DIR)]
     _start_subprocess_job(dataset=dataset_name, job_id=job_id, argv=argv)
     return jsonify({"job_id": job_id})
@@ -522,7 +672,7 @@ def upload_dataset():
     main_parquet = request.args.get("main_parquet")
     private = request.args.get("private")
 
-    job_id = str(uuid.uuid4())
+    job_id = uuid.uuid4().hex
     path = os.path.join(jobs_store.DATA_DIR or "", dataset)
     argv = [
         "ls-upload-dataset",
@@ -545,7 +695,7 @@ def run_toponymy():
     base_min_cluster_size = request.args.get("base_min_cluster_size", "10")
     context = request.args.get("context", "")
 
-    job_id = str(uuid.uuid4())
+    job_id = uuid.uuid4().hex
     argv = [
         sys.executable,
         "-m",
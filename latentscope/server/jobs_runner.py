@@ -1,15 +1,20 @@
 from __future__ import annotations
 
-import json
 import os
+import selectors
 import shutil
+import signal
 import subprocess
+import threading
 import time
 import glob
 import shlex
+from collections import deque
 from datetime import datetime
 from typing import Any
 
+import orjson
+
 from . import jobs_store
 
 
@@ -25,31 +30,76 @@ def _env_int(name: str, default: int) -> int:
 
 TIMEOUT = _env_int("LATENT_SCOPE_JOB_TIMEOUT_SEC", 60 * 30)  # default 30 minutes
 
-# Shared mutable state across request threads and job threads.
-# `run_job()` registers processes here; the `/kill` route reads from it.
-PROCESSES: dict[str, subprocess.Popen[str]] = {}
+# Progress-file flush coalescing: write at most every interval or every N
+# accumulated lines, whichever comes first.
+FLUSH_INTERVAL_SEC = 0.25
+FLUSH_MAX_LINES = 50
 
+# The meta .json only needs rewriting when a sentinel field changed; otherwise
+# it is refreshed (for last_update) at most this often.
+META_WRITE_INTERVAL_SEC = 0.5
 
-def update_job_from_output_line(job: dict[str, Any], output: str) -> None:
-    if "RUNNING:" in output:
-        run_id = output.strip().split("RUNNING: ")[1]
-        job["run_id"] = run_id
-    if "FINAL_SCOPE:" in output:
-        job["scope_id"] = output.strip().split("FINAL_SCOPE:")[1].strip()
-    if "IMPORTED_ROWS:" in output:
-        imported_rows = output.strip().split("IMPORTED_ROWS:")[1].strip()
-        try:
-            job["imported_rows"] = int(imported_rows)
-        except ValueError:
-            job["imported_rows"] = imported_rows
+# In-memory tail kept per live subprocess job; the .progress.jsonl sidecar
+# holds the full history, so RAM per job stays bounded no matter how chatty
+# the subprocess is.
+PROGRESS_TAIL_LINES = 2000
+
+# Shared mutable state across request threads and job threads.
+# `run_job()` registers processes here; the `/kill` route reads from it.
+# LIVE_JOBS holds the in-memory job dict for each running subprocess so the
+# kill route can update it directly instead of a read/parse/rewrite cycle.
+# The lock orders kill against deregistration: once run_job has popped a
+# finished job, a late /kill sees the registry empty instead of signalling
+# a pid the OS may already have recycled.
+PROCESSES: dict[str, subprocess.Popen[bytes]] = {}
+LIVE_JOBS: dict[str, dict[str, Any]] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+# Scripts emit these at line start; a startswith dispatch exits early on the
+# common non-sentinel line instead of scanning it three times.
+_SENTINELS = (
+    ("RUNNING: ", "run_id"),
+    ("FINAL_SCOPE:", "scope_id"),
+    ("IMPORTED_ROWS:", "imported_rows"),
+)
+# One C-level check rejects the typical log line before the prefix loop runs.
+_SENTINEL_FIRST_CHARS = tuple({prefix[0] for prefix, _ in _SENTINELS})
+
+
+def update_job_from_output_line(job: dict[str, Any], output: str) -> bool:
+    """Returns True when a sentinel updated the job's metadata."""
+    stripped = output.strip()
+    if not stripped.startswith(_SENTINEL_FIRST_CHARS):
+        return False
+    for prefix, key in _SENTINELS:
+        if stripped.startswith(prefix):
+            value = stripped[len(prefix):].strip()
+            if key == "imported_rows":
+                try:
+                    job[key] = int(value)
+                except ValueError:
+                    job[key] = value
+            else:
+                job[key] = value
+            return True
+    return False
 
 
 def kill_process(job_id: str) -> bool:
-    proc = PROCESSES.get(job_id)
-    if not proc:
-        return False
-    proc.kill()
-    return True
+    # Signal while holding the lock so the kill can't interleave with the
+    # registry pop of a job that just finished and was reaped.
+    with _REGISTRY_LOCK:
+        proc = PROCESSES.get(job_id)
+        if not proc:
+            return False
+        # Jobs run in their own session, so signal the whole group — killing
+        # just the leader would orphan any children it spawned.
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (OSError, AttributeError):
+            proc.kill()
+        return True
 
 
 def _job_name_from_argv(argv: list[str]) -> str:
@@ -111,18 +161,18 @@ def _is_safe_dataset_path(dataset: str, candidate_path: str) -> bool:
 
 
 def _run_delete_job(
-    *, dataset: str, job: dict[str, Any], job_id: str, globs_list: list[str], progress_file: str
+    *, dataset: str, job: dict[str, Any], job_id: str, globs_list: list[str]
 ) -> None:
     deleted: list[str] = []
     skipped: list[str] = []
     errors: list[str] = []
 
     for pattern in globs_list:
-        matches = glob.glob(pattern)
-        if not matches:
-            skipped.append(f"{pattern}: no matches")
-            continue
-        for match in matches:
+        matched = False
+        # iglob streams matches instead of materializing the whole list,
+        # which matters on giant cluster directories
+        for match in glob.iglob(pattern):
+            matched = True
             if not _is_safe_dataset_path(dataset, match):
                 skipped.append(f"{match}: outside dataset root")
                 continue
@@ -135,10 +185,10 @@ def _run_delete_job(
                 job["progress"].append(f"DELETED: {match}")
                 job["times"].append(str(datetime.now()))
                 job["last_update"] = str(datetime.now())
-                with open(progress_file, "w") as f:
-                    json.dump(job, f)
             except Exception as err:
                 errors.append(f"{match}: {err}")
+        if not matched:
+            skipped.append(f"{pattern}: no matches")
 
     if skipped:
         job["progress"].append("SKIPPED:")
@@ -178,6 +228,15 @@ def run_job(dataset: str, job_id: str, job_spec: Any, cleanup_paths: list[str] |
     if kind == "delete" and (not isinstance(delete_globs, list) or not all(isinstance(x, str) for x in delete_globs)):
         raise ValueError("Invalid delete globs")
 
+    # A /kill can land while the job is still queued in its executor; the
+    # route marks the persisted stub dead, so check on pickup instead of
+    # resurrecting the job with a fresh running record.
+    try:
+        if jobs_store.read_job_meta(dataset, job_id).get("status") == "dead":
+            return
+    except (FileNotFoundError, ValueError):
+        pass
+
     print("command", display_command)
 
     job_name = _job_name_from_argv(argv or ["delete"])
@@ -197,8 +256,7 @@ def run_job(dataset: str, job_id: str, job_spec: Any, cleanup_paths: list[str] |
     if kind == "delete":
         job["globs"] = delete_globs
 
-    with open(progress_file, "w") as f:
-        json.dump(job, f)
+    jobs_store.atomic_write_json(progress_file, job)
 
     if kind == "delete":
         return _run_delete_job(
@@ -206,7 +264,6 @@ def run_job(dataset: str, job_id: str, job_spec: Any, cleanup_paths: list[str] |
             job=job,
             job_id=job_id,
             globs_list=delete_globs or [],
-            progress_file=progress_file,
         )
 
     env = os.environ.copy()
@@ -215,52 +272,147 @@ def run_job(dataset: str, job_id: str, job_spec: Any, cleanup_paths: list[str] |
         argv,  # type: ignore[arg-type]
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
         shell=False,
-        encoding="utf-8",
         env=env,
-        bufsize=1,
+        start_new_session=True,
     )
-    PROCESSES[job_id] = process  # type: ignore[assignment]
-
+    with _REGISTRY_LOCK:
+        PROCESSES[job_id] = process
+        LIVE_JOBS[job_id] = job
+
+    # Drain stdout via a non-blocking fd so one select() wakeup can consume a
+    # whole burst of lines, and coalesce progress-file writes instead of
+    # rewriting the growing JSON once per line.
+    stdout_fd = process.stdout.fileno()  # type: ignore[union-attr]
+    os.set_blocking(stdout_fd, False)
+    sel = selectors.DefaultSelector()
+    sel.register(stdout_fd, selectors.EVENT_READ)
+
+    # Progress lines stream to an append-only sidecar; the .json file holds
+    # only the small metadata, so a flush costs O(new lines) instead of
+    # re-serializing the whole history. In memory we keep only a bounded
+    # tail — the sidecar is the full record.
+    job["progress_log"] = True
+    job["progress"] = deque(job["progress"], maxlen=PROGRESS_TAIL_LINES)
+    job["times"] = deque(job["times"], maxlen=PROGRESS_TAIL_LINES)
+    progress_log = open(jobs_store.progress_log_path(dataset, job_id), "ab")
+
+    buffer = b""
+    pending: list[tuple[float, str]] = []
+    meta_dirty = False
+    last_flush = 0.0
+    last_meta_write = time.time()
     last_output_time = time.time()
     timed_out = False
 
+    def record_line(line: str) -> None:
+        # Per-line cost is just a float timestamp; datetime formatting waits
+        # until the batched flush.
+        nonlocal meta_dirty
+        stripped = line.strip()
+        print(stripped)
+        if update_job_from_output_line(job, line):
+            meta_dirty = True
+        now = time.time()
+        job["progress"].append(stripped)
+        job["times"].append(now)
+        job["last_update"] = now
+        pending.append((now, stripped))
+
+    def flush_progress(force: bool = False) -> None:
+        nonlocal last_flush, last_meta_write, meta_dirty
+        now = time.time()
+        if not force:
+            if not pending:
+                return
+            if len(pending) < FLUSH_MAX_LINES and now - last_flush < FLUSH_INTERVAL_SEC:
+                return
+        if pending:
+            progress_log.write(
+                b"".join(
+                    orjson.dumps({"t": str(datetime.fromtimestamp(ts)), "line": line}) + b"\n"
+                    for ts, line in pending
+                )
+            )
+            progress_log.flush()
+            pending.clear()
+        # Only rewrite the meta snapshot when something a reader cares about
+        # changed, or on a coarse cadence to keep last_update fresh.
+        if force or meta_dirty or now - last_meta_write > META_WRITE_INTERVAL_SEC:
+            meta = {k: v for k, v in job.items() if k not in ("progress", "times")}
+            meta["progress"] = []
+            meta["times"] = []
+            if isinstance(meta.get("last_update"), float):
+                meta["last_update"] = str(datetime.fromtimestamp(meta["last_update"]))
+            jobs_store.atomic_write_json(progress_file, meta)
+            meta_dirty = False
+            last_meta_write = now
+        last_flush = now
+
     while True:
-        output = process.stdout.readline()  # type: ignore[union-attr]
+        # Sleep short while lines are pending flush; otherwise back off toward
+        # the remaining timeout budget (capped at 5s) so a silent subprocess
+        # costs a handful of wakeups per minute, not four per second.
+        if pending:
+            select_timeout = FLUSH_INTERVAL_SEC
+        else:
+            remaining = TIMEOUT - (time.time() - last_output_time)
+            select_timeout = max(FLUSH_INTERVAL_SEC, min(5.0, remaining))
+        events = sel.select(timeout=select_timeout)
         current_time = time.time()
-        print(current_time, current_time - last_output_time, TIMEOUT)
-        print("output", output)
-
-        if output == "" and process.poll() is not None:
-            break
-        if output:
-            print(output.strip())
-            update_job_from_output_line(job, output)
-            job["progress"].append(output.strip())
-            job["times"].append(str(datetime.now()))
-            job["last_update"] = str(datetime.now())
-            with open(progress_file, "w") as f:
-                json.dump(job, f)
+        chunk = None
+        if events:
+            try:
+                chunk = os.read(stdout_fd, 65536)
+            except BlockingIOError:
+                chunk = None
+
+        if chunk:
+            # Universal-newline handling at the byte level: tqdm-style \r
+            # frames become separate lines instead of accumulating into one
+            # giant buffered line (text=True used to do this translation).
+            # A trailing \r is held back in case its \n lands in the next read.
+            data = buffer + chunk
+            hold = b""
+            if data.endswith(b"\r"):
+                data, hold = data[:-1], b"\r"
+            parts = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n").split(b"\n")
+            buffer = parts.pop() + hold
+            for raw in parts:
+                record_line(raw.decode("utf-8", errors="replace"))
             last_output_time = current_time
+            flush_progress()
+        elif chunk == b"":
+            # EOF — the process closed its stdout.
+            break
+        elif process.poll() is not None:
+            break
         elif current_time - last_output_time > TIMEOUT:
-            print(f"Timeout: No output for more than {TIMEOUT} seconds.")
-            print("OUTPUT", output)
-            job["progress"].append(output.strip())
-            job["progress"].append(f"Timeout: No output for more than {TIMEOUT} seconds.")
+            record_line(f"Timeout: No output for more than {TIMEOUT} seconds.")
             job["status"] = "error"
             timed_out = True
             try:
-                process.terminate()
+                os.killpg(process.pid, signal.SIGTERM)
                 process.wait(timeout=10)
             except Exception:
-                process.kill()
+                try:
+                    os.killpg(process.pid, signal.SIGKILL)
+                except OSError:
+                    process.kill()
             break
+        else:
+            # Idle tick: push out lines coalesced from the last burst so a
+            # quiet spell doesn't leave them unflushed.
+            flush_progress()
+
+    if buffer:
+        record_line(buffer.decode("utf-8", errors="replace"))
+    sel.close()
 
     if process.returncode is None:
         process.wait()
 
-    if not timed_out:
+    if not timed_out and "cause_of_death" not in job:
         job["status"] = "completed" if process.returncode == 0 else "error"
 
     if cleanup_paths:
@@ -280,13 +432,21 @@ def run_job(dataset: str, job_id: str, job_spec: Any, cleanup_paths: list[str] |
             except Exception as err:
                 cleanup_errors.append(f"{path}: {err}")
         if cleanup_skipped:
-            job["progress"].append("Cleanup skipped:")
-            job["progress"].extend(cleanup_skipped)
+            record_line("Cleanup skipped:")
+            for entry in cleanup_skipped:
+                record_line(entry)
         if cleanup_errors:
-            job["progress"].append("Cleanup errors:")
-            job["progress"].extend(cleanup_errors)
+            record_line("Cleanup errors:")
+            for entry in cleanup_errors:
+                record_line(entry)
         else:
-            job["progress"].append("Cleaned up temporary upload files.")
-
-    PROCESSES.pop(job_id, None)
-    jobs_store.write_job(dataset, job_id, job)
+            record_line("Cleaned up temporary upload files.")
+
+    # Final meta write; the sidecar stays as the full progress record and
+    # readers hydrate from it, so finishing a long job never re-serializes
+    # its whole history.
+    flush_progress(force=True)
+    progress_log.close()
+    with _REGISTRY_LOCK:
+        PROCESSES.pop(job_id, None)
+        LIVE_JOBS.pop(job_id, None)
@@ -6,6 +6,14 @@ Job progress persistence.
 Each job writes a JSON file at:
   {LATENT_SCOPE_DATA}/{dataset}/jobs/{job_id}.json
 
+For subprocess jobs, per-line progress is appended to a sidecar
+  {job_id}.progress.jsonl
+(one {"t": ..., "line": ...} record per line) and the .json file holds only the
+small metadata with "progress_log": true. The sidecar is the full record — the
+runner keeps only a bounded tail in memory — and readers merge it back into
+progress/times. write_job() consolidates when handed a fully hydrated dict
+(e.g. the kill flow) and removes the sidecar then.
+
 The schema is intentionally loose (dict) but the runner and routes coordinate on
 these common fields:
 - id, dataset, job_name, command
@@ -15,11 +23,12 @@ these common fields:
 - optional: cause_of_death (set by /kill)
 """
 
-import json
 import os
 import time
 from typing import Any
 
+import orjson
+
 DATA_DIR = os.getenv("LATENT_SCOPE_DATA")
 
 
@@ -41,22 +50,116 @@ def job_progress_path(dataset: str, job_id: str) -> str:
     return os.path.join(job_dir, f"{job_id}.json")
 
 
+def progress_log_path(dataset: str, job_id: str) -> str:
+    job_dir = ensure_job_dir(dataset)
+    return os.path.join(job_dir, f"{job_id}.progress.jsonl")
+
+
+def atomic_write_json(path: str, obj: Any) -> None:
+    """Serialize with orjson and publish via rename so readers never see a
+    partially written file."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(orjson.dumps(obj))
+    os.replace(tmp, path)
+
+
+def _hydrate_progress(job: dict[str, Any], json_path: str) -> dict[str, Any]:
+    """Merge the append-only progress sidecar back into progress/times."""
+    if not job.get("progress_log"):
+        return job
+    log_path = json_path[: -len(".json")] + ".progress.jsonl"
+    progress = list(job.get("progress", []))
+    times = list(job.get("times", []))
+    try:
+        with open(log_path, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = orjson.loads(line)
+                except ValueError:
+                    continue
+                progress.append(record.get("line", ""))
+                times.append(record.get("t", ""))
+    except FileNotFoundError:
+        pass
+    job["progress"] = progress
+    job["times"] = times
+    return job
+
+
 def write_job(dataset: str, job_id: str, job: dict[str, Any]) -> None:
+    # Callers hand over fully hydrated dicts; consolidate and drop the sidecar.
+    if job.get("progress_log"):
+        job = dict(job)
+        job.pop("progress_log", None)
+        try:
+            os.remove(progress_log_path(dataset, job_id))
+        except FileNotFoundError:
+            pass
     path = job_progress_path(dataset, job_id)
-    with open(path, "w") as f:
-        json.dump(job, f)
+    atomic_write_json(path, job)
 
 
 def read_job(dataset: str, job_id: str) -> dict[str, Any]:
+    # Writers publish via os.replace, so a read always sees a complete file —
+    # no mid-write retry needed.
     path = job_progress_path(dataset, job_id)
-    with open(path, "r") as f:
-        try:
-            return json.load(f)
-        except Exception:
-            # Preserve legacy behavior: brief sleep and retry if the file is mid-write.
-            time.sleep(0.1)
-    with open(path, "r") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        return _hydrate_progress(orjson.loads(f.read()), path)
+
+
+def read_job_meta(dataset: str, job_id: str) -> dict[str, Any]:
+    """The raw meta .json without hydrating the progress sidecar."""
+    with open(job_progress_path(dataset, job_id), "rb") as f:
+        return orjson.loads(f.read())
+
+
+def read_progress_tail(dataset: str, job_id: str, offset: int) -> tuple[list[str], int]:
+    """Sidecar JSONL records past a byte offset, plus the new offset.
+
+    Lets pollers fetch only what they have not seen instead of re-reading and
+    re-parsing the whole history each poll.
+    """
+    path = progress_log_path(dataset, job_id)
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            tail = f.read()
+    except FileNotFoundError:
+        return [], offset
+    # Only consume up to the last newline: a read that lands mid-append would
+    # otherwise hand the client a torn record and skip its remaining bytes
+    # forever. The partial line is re-read on the next poll.
+    end = tail.rfind(b"\n") + 1
+    if not end:
+        return [], offset
+    return tail[:end].decode("utf-8", errors="replace").splitlines(), offset + end
+
+
+def job_etag(dataset: str, job_id: str) -> str | None:
+    """Change validator built from (mtime, size) of the meta file and sidecar."""
+    try:
+        st = os.stat(job_progress_path(dataset, job_id))
+    except FileNotFoundError:
+        return None
+    tag = f"{st.st_mtime_ns}-{st.st_size}"
+    try:
+        log_st = os.stat(progress_log_path(dataset, job_id))
+    except FileNotFoundError:
+        return tag
+    return f"{tag}-{log_st.st_mtime_ns}-{log_st.st_size}"
+
+
+# The UI polls /jobs/all; most job files are terminal and never change. Cache
+# parsed entries per (filename, mtime) and short-circuit whole scans within a
+# small TTL window. Jobs still running against a progress sidecar are always
+# re-read so new sidecar lines show up promptly; terminal jobs are reused by
+# mtime even when their history lives in the sidecar.
+_LIST_TTL_SEC = 1.0
+_LIST_CACHE: dict[str, dict[str, Any]] = {}
 
 
 def list_jobs(dataset: str) -> list[dict[str, Any]]:
@@ -65,9 +168,29 @@ def list_jobs(dataset: str) -> list[dict[str, Any]]:
     out: list[dict[str, Any]] = []
     if not os.path.exists(job_dir):
         return out
-    for file in os.listdir(job_dir):
-        if not file.endswith(".json"):
-            continue
-        with open(os.path.join(job_dir, file), "r") as f:
-            out.append(json.load(f))
+
+    now = time.time()
+    cache = _LIST_CACHE.get(dataset)
+    if cache is not None and now - cache["at"] < _LIST_TTL_SEC:
+        return cache["jobs"]
+
+    by_file = cache["by_file"] if cache is not None else {}
+    new_by_file: dict[str, tuple[int, dict[str, Any]]] = {}
+    with os.scandir(job_dir) as it:
+        for entry in it:
+            if not entry.name.endswith(".json") or not entry.is_file():
+                continue
+            mtime_ns = entry.stat().st_mtime_ns
+            cached = by_file.get(entry.name)
+            if cached is not None and cached[0] == mtime_ns and not (
+                cached[1].get("progress_log") and cached[1].get("status") == "running"
+            ):
+                job = cached[1]
+            else:
+                with open(entry.path, "rb") as f:
+                    job = _hydrate_progress(orjson.loads(f.read()), entry.path)
+            new_by_file[entry.name] = (mtime_ns, job)
+            out.append(job)
+
+    _LIST_CACHE[dataset] = {"at": now, "by_file": new_by_file, "jobs": out}
     return out
@@ -39,3 +39,35 @@ def test_build_delete_embedding_globs_includes_sae_artifacts(tmp_path, monkeypat
     globs = jobs_delete.build_delete_embedding_globs(dataset, embedding_id)
     assert any(g.endswith(f"/{dataset}/embeddings/{embedding_id}*") for g in globs)
     assert any(g.endswith(f"/{dataset}/saes/sae-1*") for g in globs)
+
+
+def test_build_cascade_delete_embedding_globs_covers_closure(tmp_path, monkeypatch):
+    monkeypatch.setenv("LATENT_SCOPE_DATA", str(tmp_path))
+
+    import latentscope.server.jobs_store as jobs_store
+    importlib.reload(jobs_store)
+
+    import latentscope.server.jobs_delete as jobs_delete
+    importlib.reload(jobs_delete)
+
+    dataset = "ds"
+    embedding_id = "emb-1"
+
+    (tmp_path / dataset / "saes").mkdir(parents=True)
+    (tmp_path / dataset / "saes" / "sae-1.json").write_text(json.dumps({"embedding_id": embedding_id}))
+    (tmp_path / dataset / "umaps").mkdir(parents=True)
+    (tmp_path / dataset / "umaps" / "umap-001.json").write_text(json.dumps({"embedding_id": embedding_id}))
+    (tmp_path / dataset / "umaps" / "umap-002.json").write_text(json.dumps({"sae_id": "sae-1"}))
+    (tmp_path / dataset / "umaps" / "umap-003.json").write_text(json.dumps({"embedding_id": "other"}))
+    (tmp_path / dataset / "clusters").mkdir(parents=True)
+    (tmp_path / dataset / "clusters" / "cluster-001.json").write_text(json.dumps({"umap_id": "umap-001"}))
+    (tmp_path / dataset / "clusters" / "cluster-002.json").write_text(json.dumps({"umap_id": "umap-003"}))
+
+    globs = jobs_delete.build_cascade_delete_embedding_globs(dataset, embedding_id)
+    assert any(g.endswith(f"/{dataset}/embeddings/{embedding_id}*") for g in globs)
+    assert any(g.endswith(f"/{dataset}/saes/sae-1*") for g in globs)
+    assert any(g.endswith(f"/{dataset}/umaps/umap-001*") for g in globs)
+    assert any(g.endswith(f"/{dataset}/umaps/umap-002*") for g in globs)
+    assert not any("umap-003" in g for g in globs)
+    assert any(g.endswith(f"/{dataset}/clusters/cluster-001*") for g in globs)
+    assert not any("cluster-002" in g for g in globs)
@@ -22,3 +22,67 @@ def test_kill_process_returns_false_when_missing() -> None:
     import latentscope.server.jobs_runner as jobs_runner
 
     assert jobs_runner.kill_process("does-not-exist") is False
+
+
+def test_run_job_skips_job_killed_while_queued(tmp_path, monkeypatch) -> None:
+    import importlib
+    import sys
+
+    monkeypatch.setenv("LATENT_SCOPE_DATA", str(tmp_path))
+
+    import latentscope.server.jobs_store as jobs_store
+
+    importlib.reload(jobs_store)
+    import latentscope.server.jobs_runner as jobs_runner
+
+    importlib.reload(jobs_runner)
+
+    jobs_store.write_job(
+        "ds",
+        "job-q",
+        {
+            "id": "job-q",
+            "dataset": "ds",
+            "status": "dead",
+            "cause_of_death": "killed",
+            "progress": [],
+            "times": [],
+        },
+    )
+    marker = tmp_path / "ran.txt"
+    jobs_runner.run_job(
+        "ds",
+        "job-q",
+        {
+            "kind": "subprocess",
+            "argv": [sys.executable, "-c", f"open({str(marker)!r}, 'w')"],
+            "display_command": "noop",
+        },
+    )
+    assert not marker.exists()
+    job = jobs_store.read_job("ds", "job-q")
+    assert job["status"] == "dead"
+    assert job["cause_of_death"] == "killed"
+
+
+def test_run_job_clears_live_job_registry(tmp_path, monkeypatch) -> None:
+    import importlib
+    import sys
+
+    monkeypatch.setenv("LATENT_SCOPE_DATA", str(tmp_path))
+
+    import latentscope.server.jobs_store as jobs_store
+
+    importlib.reload(jobs_store)
+    import latentscope.server.jobs_runner as jobs_runner
+
+    importlib.reload(jobs_runner)
+
+    jobs_runner.run_job(
+        "ds",
+        "job-1",
+        {"kind": "subprocess", "argv": [sys.executable, "-c", "print('hi')"], "display_command": "noop"},
+    )
+    assert "job-1" not in jobs_runner.LIVE_JOBS
+    assert "job-1" not in jobs_runner.PROCESSES
+    assert jobs_store.read_job("ds", "job-1")["status"] == "completed"
@@ -0,0 +1,37 @@
+import importlib
+
+
+def test_read_progress_tail_holds_partial_line(tmp_path, monkeypatch):
+    monkeypatch.setenv("LATENT_SCOPE_DATA", str(tmp_path))
+
+    import latentscope.server.jobs_store as jobs_store
+    importlib.reload(jobs_store)
+
+    jobs_store.ensure_job_dir("ds")
+    path = jobs_store.progress_log_path("ds", "job-1")
+    with open(path, "wb") as f:
+        f.write(b'{"t":"1","line":"a"}\n{"t":"2","li')
+
+    lines, offset = jobs_store.read_progress_tail("ds", "job-1", 0)
+    assert lines == ['{"t":"1","line":"a"}']
+    assert offset == 21
+
+    # nothing new until the writer completes the torn record
+    lines, offset = jobs_store.read_progress_tail("ds", "job-1", offset)
+    assert lines == []
+    assert offset == 21
+
+    with open(path, "ab") as f:
+        f.write(b'ne":"b"}\n')
+
+    lines, offset = jobs_store.read_progress_tail("ds", "job-1", 21)
+    assert lines == ['{"t":"2","line":"b"}']
+
+
+def test_read_progress_tail_missing_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("LATENT_SCOPE_DATA", str(tmp_path))
+
+    import latentscope.server.jobs_store as jobs_store
+    importlib.reload(jobs_store)
+
+    assert jobs_store.read_progress_tail("ds", "nope", 0) == ([], 0)